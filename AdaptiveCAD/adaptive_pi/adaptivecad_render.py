@@ -1,5 +1,8 @@
 # Render \u03c1 on a genus-3 mesh via your AdaptiveCAD kernel as a PNG.
-# Supports mode="tempered" (\u03c1 \u2248 1 + cK) and mode="exact" (sinh/sin laws).
+# Supports mode="tempered" (\u03c1 \u2248 1 + cK), mode="exact" (sinh/sin laws) and
+# mode="adaptive" (series where accurate to RHO_TOL, sinh/sin elsewhere).
+# Run from AdaptiveCAD/ as `python adaptive_pi/adaptivecad_render.py` or
+# `python -m adaptive_pi.adaptivecad_render`.
 
 import math
 import json
@@ -8,15 +11,29 @@ from pathlib import Path
 import numpy as np
 import matplotlib.pyplot as plt
 
+if __package__ in (None, ""):
+    # Also runnable as a plain script: python adaptive_pi/adaptivecad_render.py
+    import sys
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    __package__ = "adaptive_pi"
+
+from .precision import cast_mesh, drift_report, gb_sum, nbytes
+from .result_cache import ResultCache, cache_key, restore_pngs
+from .rho_series import rho_adaptive
+
 # ==== USER PARAMS (adjust as you like) ====
-MODE   = "tempered"           # "tempered" or "exact"
+MODE   = "tempered"           # "tempered", "exact" or "adaptive"
 R_V    = 2.09                 # for exact mode or to derive c
 R_F    = 0.80
 C_CONST= -0.623               # used when MODE=="tempered"
 R_MODEL= 1.30                 # radius used in K(r) mapping
+RHO_TOL= 1e-10                # absolute ρ tolerance for MODE=="adaptive"
 K0     = -26.8                # K(r) = K0 + β r^2
 BETA   = 12.5
 OUTPNG = "outputs/adaptivecad_rho.png"
+PRECISION = "double"          # "double" or "compact" (float32 V/A/K/ρ, int32 F)
+CACHE_DIR = None              # e.g. "outputs/.cache" to reuse identical runs
+CACHE_MAX_BYTES = 256 * 2**20 # LRU eviction budget for CACHE_DIR
 # ==========================================
 
 # ---- exact \u03c1(K; r_v, r_f) ----
@@ -70,43 +87,48 @@ def render_face_scalar_png(V, F, values, outfile, title=""):
     fig.savefig(outfile, dpi=220, bbox_inches="tight")
     plt.close(fig)
 
-def main():
-    # === 1) Load mesh from AdaptiveCAD ===
-    V, F, A = load_mesh_from_adaptivecad()
-    V = np.asarray(V, float)
-    F = np.asarray(F, int)
-    A = np.asarray(A, float)
+def compute_rho_field(V, F, A, mode=MODE, rv=R_V, rf=R_F, c=C_CONST,
+                      r_model_max=R_MODEL, k0=K0, beta=BETA, target_chi=-4,
+                      rho_tol=RHO_TOL):
+    """
+    Steps 2-4 of the pipeline: K(r) = k0 + beta r^2 on rescaled barycenter
+    radii, Gauss–Bonnet normalisation to 2πχ, then per-face ρ.
+    Per-face arrays keep the dtype of V/A; the Gauss–Bonnet sums are float64.
+    mode="adaptive" matches "exact" to within rho_tol and records the
+    series/exact face split in stats.
+    Returns (K_face, rho_face, stats).
+    """
     bary = V[F].mean(axis=1)
 
     # === 2) Map radii to [0, R_MODEL] and build raw K(r) ===
     r_mesh = np.linalg.norm(bary, axis=1)
-    r_scale = R_MODEL / r_mesh.max()
+    r_scale = float(r_model_max / r_mesh.max())
     r_model = r_scale * r_mesh
-    K_raw = K0 + BETA * (r_model ** 2)
+    K_raw = k0 + beta * (r_model ** 2)
 
-    # === 3) Enforce Gauss–Bonnet: sum_f K_f A_f = -8π (g=3) ===
-    target = -8.0 * math.pi
-    current = float((K_raw * A).sum())
+    # === 3) Enforce Gauss–Bonnet: sum_f K_f A_f = 2πχ (-8π for g=3) ===
+    target = 2.0 * math.pi * float(target_chi)
+    current = gb_sum(K_raw, A)
     s = target / current
     K_face = s * K_raw
 
     # === 4) Build \u03c1 per face ===
-    rho_face = np.array([
-        rho_value(k, MODE, R_V, R_F, C_CONST) for k in K_face
-    ], float)
-
-    # === 5) Render PNG with AdaptiveCAD’s renderer ===
-    render_face_scalar_png(V, F, rho_face, OUTPNG, title=f"\u03c1 ({MODE})")
+    rho_info = None
+    if mode == "adaptive":
+        rho_face, rho_info = rho_adaptive(K_face, rv, rf, rho_tol)
+    else:
+        rho_face = np.array([
+            rho_value(k, mode, rv, rf, c) for k in K_face
+        ], K_face.dtype)
 
-    # === 6) Save a tiny JSON with stats so we can sanity-check ===
     stats = {
-        "mode": MODE,
-        "r_v": R_V,
-        "r_f": R_F,
-        "c": C_CONST,
+        "mode": mode,
+        "r_v": rv,
+        "r_f": rf,
+        "c": c,
         "r_scale": r_scale,
         "GB_scale": s,
-        "GB_sum_KA": float((K_face * A).sum()),
+        "GB_sum_KA": gb_sum(K_face, A),
         "GB_target": target,
         "K_min": float(K_face.min()),
         "K_max": float(K_face.max()),
@@ -115,8 +137,59 @@ def main():
         "rho_max": float(rho_face.max()),
         "rho_mean": float(rho_face.mean()),
     }
-    with open(OUTPNG.replace(".png", "_stats.json"), "w") as f:
+    if rho_info is not None:
+        stats["rho_adaptive"] = rho_info
+    return K_face, rho_face, stats
+
+def main():
+    # === 1) Load mesh from AdaptiveCAD ===
+    V64, F64, A64 = load_mesh_from_adaptivecad()
+    V, F, A = cast_mesh(V64, F64, A64, PRECISION)
+    stats_path = OUTPNG.replace(".png", "_stats.json")
+
+    cache = key = None
+    if CACHE_DIR:
+        cache = ResultCache(CACHE_DIR, CACHE_MAX_BYTES)
+        key = cache_key(
+            {"V": V, "F": F, "A": A},
+            {"pipeline": "adaptivecad_render", "mode": MODE, "r_v": R_V,
+             "r_f": R_F, "c": C_CONST, "r_model": R_MODEL, "K0": K0,
+             "beta": BETA, "target_chi": -4, "precision": PRECISION,
+             "rho_tol": RHO_TOL if MODE == "adaptive" else None},
+        )
+        hit = cache.get(key)
+        if hit is not None and restore_pngs(hit, {"rho": OUTPNG}):
+            with open(stats_path, "w") as f:
+                json.dump(hit["stats"], f, indent=2)
+            print("Cache hit:", OUTPNG)
+            return
+
+    # === 2-4) K(r), Gauss–Bonnet, \u03c1 per face ===
+    params = (MODE, R_V, R_F, C_CONST, R_MODEL, K0, BETA)
+    K_face, rho_face, stats = compute_rho_field(V, F, A, *params, rho_tol=RHO_TOL)
+    if "rho_adaptive" in stats:
+        info = stats["rho_adaptive"]
+        print(f"adaptive ρ: {info['series_faces']} series / {info['exact_faces']} exact faces, "
+              f"max error bound {info['max_error_bound']:.3g}")
+    stats["precision"] = PRECISION
+    stats["field_bytes"] = nbytes(V, F, A, K_face, rho_face)
+    if PRECISION != "double":
+        # Report how far the compact run drifts from a float64 reference run
+        # on the mesh as loaded (input rounding included).
+        K_ref, rho_ref, _ = compute_rho_field(V64, F64, A64, *params, rho_tol=RHO_TOL)
+        stats["precision_drift"] = drift_report(
+            {"K_face": K_ref, "rho": rho_ref}, {"K_face": K_face, "rho": rho_face}
+        )
+
+    # === 5) Render PNG with AdaptiveCAD’s renderer ===
+    render_face_scalar_png(V, F, rho_face, OUTPNG, title=f"\u03c1 ({MODE})")
+
+    # === 6) Save a tiny JSON with stats so we can sanity-check ===
+    with open(stats_path, "w") as f:
         json.dump(stats, f, indent=2)
+    if cache is not None:
+        cache.put(key, {"K_face": K_face, "rho": rho_face}, stats,
+                  pngs={"rho": OUTPNG})
     print("Wrote:", OUTPNG)
 
 if __name__ == "__main__":
@@ -0,0 +1,316 @@
+"""
+Batch driver: run the K-solve → Gauss–Bonnet → ρ pipeline for many
+(mesh, job) pairs on a process pool.
+
+Each mesh is loaded once by the parent into POSIX shared memory; workers
+attach to the blocks by name and wrap them as read-only NumPy views, so the
+arrays are never pickled or copied per worker. A failing job is reported in
+its row of the results table and does not affect the other jobs.
+
+Manifest (JSON; relative paths resolve against the manifest's directory):
+
+    {
+      "meshes": {
+        "user_params": {"prefix": "user_params"},
+        "klein":       {"prefix": "klein", "root": "."}
+      },
+      "jobs": [
+        {"id": "up_1.7", "mesh": "user_params", "rho": 1.7, "mode": "exact"},
+        {"mesh": "klein", "rho": {"type": "concentric_bumps", "inner": 1.3, "outer": 1.5}}
+      ]
+    }
+
+Usage:
+    python -m adaptive_pi.batch manifest.json --workers 8 --out outputs/batch_results.csv
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from .driver_adaptivecad import (
+    concentric_bumps,
+    constant_field,
+    constant_scales,
+    gauss_bonnet_normalize,
+    rho_from_K,
+    solve_per_face_K,
+)
+from .mesh_io import Mesh, load_mesh_csv
+from .precision import cast_mesh, drift_report, gb_sum
+from .rho_series import rho_adaptive
+
+# Defaults mirror driver_adaptivecad.main
+JOB_DEFAULTS = {
+    "rho": 1.7,
+    "r_v": 1.0,
+    "r_f": 0.8,
+    "branch": "hyperbolic",
+    "target_chi": -4,
+    "mode": "tempered",
+    "recover_r_v": 2.09,
+    "recover_r_f": 0.8,
+    "c": -0.623,
+    "rho_tol": 1e-10,  # mode "adaptive" only
+}
+
+
+# ------- shared-memory mesh blocks -------
+class SharedMesh:
+    """V/F/A copied once into shared memory; owned (and unlinked) by the parent."""
+
+    def __init__(self, V, F, A):
+        self._blocks = []
+        self.desc = {}
+        for name, arr in (("V", V), ("F", F), ("A", A)):
+            arr = np.ascontiguousarray(arr)
+            shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            view = np.ndarray(arr.shape, arr.dtype, buffer=shm.buf)
+            view[...] = arr
+            self._blocks.append(shm)
+            self.desc[name] = (shm.name, arr.shape, arr.dtype.str)
+
+    def close(self):
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+
+# Per-worker state: attached blocks (kept referenced so views stay valid) and meshes.
+_worker_blocks = []
+_worker_meshes: Dict[str, Mesh] = {}
+_worker_refs: Dict[str, Mesh] = {}  # float64 originals of compact meshes
+
+
+def _attach(desc):
+    arrays = {}
+    for name, (shm_name, shape, dtype) in desc.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker_blocks.append(shm)
+        view = np.ndarray(shape, np.dtype(dtype), buffer=shm.buf)
+        view.flags.writeable = False
+        arrays[name] = view
+    return Mesh(arrays["V"], arrays["F"], arrays["A"])
+
+
+def _init_worker(descriptors, ref_descriptors):
+    for mesh_name, desc in descriptors.items():
+        _worker_meshes[mesh_name] = _attach(desc)
+    for mesh_name, desc in ref_descriptors.items():
+        _worker_refs[mesh_name] = _attach(desc)
+
+
+# ------- pipeline -------
+def make_field(spec):
+    """Job "rho" entry → ρ(x): a number, or {"type": "constant"|"concentric_bumps", ...}."""
+    if isinstance(spec, (int, float)):
+        return constant_field(float(spec))
+    kind = spec.get("type", "constant")
+    if kind == "constant":
+        return constant_field(float(spec["value"]))
+    if kind == "concentric_bumps":
+        return concentric_bumps(
+            center=tuple(spec.get("center", (0.0, 0.0, 0.0))),
+            inner=spec.get("inner", 1.15),
+            outer=spec.get("outer", 1.25),
+        )
+    raise ValueError(f"unknown rho field type {kind!r}")
+
+
+def _fields(mesh, job):
+    """(K_face, ρ, Σ K_raw·A, adaptive-mode columns) for one job."""
+    K_face = solve_per_face_K(
+        mesh,
+        make_field(job["rho"]),
+        constant_scales(r_v=job["r_v"], r_f=job["r_f"]),
+        branch=job["branch"],
+    )
+    K_raw_sum = gb_sum(K_face, mesh.A)
+    K_face = gauss_bonnet_normalize(mesh, K_face, target_chi=job["target_chi"])
+    extra = {}
+    if job["mode"] == "adaptive":
+        rho_faces, info = rho_adaptive(K_face, job["recover_r_v"], job["recover_r_f"], job["rho_tol"])
+        extra = {"rho_series_faces": info["series_faces"], "rho_exact_faces": info["exact_faces"],
+                 "rho_max_error_bound": info["max_error_bound"]}
+    else:
+        rho_faces = np.array([
+            rho_from_K(None, lambda _p, k=k: k, mode=job["mode"],
+                       r_v=job["recover_r_v"], r_f=job["recover_r_f"], c=job["c"])
+            for k in K_face
+        ], K_face.dtype)
+    return K_face, rho_faces, K_raw_sum, extra
+
+
+def run_pipeline(mesh, job, out_dir=None, ref_mesh=None):
+    """
+    Solve K, normalise to 2πχ and recover ρ for one job. Returns a stats row.
+    With ref_mesh (the float64 original of a compact mesh) the job is rerun
+    in double precision and the K/ρ drift is added as drift_* columns.
+    """
+    K_face, rho_faces, K_raw_sum, extra = _fields(mesh, job)
+    if ref_mesh is not None:
+        K_ref, rho_ref, _, _ = _fields(ref_mesh, job)
+        drift = drift_report({"K_face": K_ref, "rho": rho_ref}, {"K_face": K_face, "rho": rho_faces})
+        for name, d in drift.items():
+            extra.update({f"drift_{name}_{k}": v for k, v in d.items()})
+    target = 2.0 * math.pi * job["target_chi"]
+    if out_dir is not None:
+        np.savez(Path(out_dir) / f"{job['id']}.npz", K_face=K_face, rho=rho_faces)
+    return {
+        "n_faces": int(len(K_face)),
+        "GB_scale": target / K_raw_sum if abs(K_raw_sum) >= 1e-14 else 1.0,
+        "GB_sum_KA": gb_sum(K_face, mesh.A),
+        "GB_target": target,
+        "K_min": float(K_face.min()),
+        "K_max": float(K_face.max()),
+        "K_mean": float(K_face.mean()),
+        "rho_min": float(rho_faces.min()),
+        "rho_max": float(rho_faces.max()),
+        "rho_mean": float(rho_faces.mean()),
+        **extra,
+    }
+
+
+def _run_job(job, out_dir):
+    row = {"id": job["id"], "mesh": job["mesh"], "mode": job["mode"], "pid": os.getpid()}
+    t0 = time.perf_counter()
+    try:
+        row.update(run_pipeline(_worker_meshes[job["mesh"]], job, out_dir,
+                                _worker_refs.get(job["mesh"])))
+        row["status"] = "ok"
+        row["error"] = ""
+    except Exception as exc:
+        row["status"] = "failed"
+        row["error"] = f"{type(exc).__name__}: {exc}"
+        row["traceback"] = traceback.format_exc()
+    row["seconds"] = time.perf_counter() - t0
+    return row
+
+
+# ------- manifest / driver -------
+def load_manifest(path):
+    path = Path(path)
+    with open(path) as f:
+        manifest = json.load(f)
+    base = path.resolve().parent
+    jobs = []
+    for i, spec in enumerate(manifest.get("jobs", [])):
+        job = dict(JOB_DEFAULTS)
+        job.update(spec)
+        job.setdefault("id", f"{job['mesh']}_{i}")
+        jobs.append(job)
+    meshes = {}
+    for name, spec in manifest.get("meshes", {}).items():
+        meshes[name] = {"prefix": spec.get("prefix", name),
+                        "root": base / spec.get("root", ".")}
+    return meshes, jobs
+
+
+def run_batch(meshes, jobs, workers=None, out_dir=None, precision="double") -> pd.DataFrame:
+    """
+    meshes: {name: {"prefix", "root"}}; jobs: list of job dicts (see JOB_DEFAULTS).
+    Only meshes referenced by a job are loaded, with the dtypes of `precision`.
+    For a non-double precision the float64 mesh is shared as well, and every
+    row reports its K/ρ drift against a float64 run. Returns one row per job,
+    in job order. Every job needs a unique "id" (it names the row and the
+    .npz/PNG outputs); a missing or repeated id raises ValueError before any
+    worker starts.
+    """
+    if not jobs:
+        return pd.DataFrame(columns=["id", "mesh", "mode", "status", "error", "seconds"])
+    seen = set()
+    for i, job in enumerate(jobs):
+        if "id" not in job:
+            raise ValueError(f"job {i} has no 'id'")
+        if job["id"] in seen:
+            raise ValueError(f"duplicate job id {job['id']!r}")
+        seen.add(job["id"])
+
+    rows = []
+    shared, refs = {}, {}
+    used = {job["mesh"] for job in jobs}
+    try:
+        for name in sorted(used):
+            if name not in meshes:
+                continue
+            try:
+                V, F, A = load_mesh_csv(meshes[name]["prefix"], meshes[name]["root"])
+                if precision != "double":
+                    refs[name] = SharedMesh(V, F, A)
+                    V, F, A = cast_mesh(V, F, A, precision)
+            except (OSError, ValueError) as exc:
+                meshes[name]["error"] = f"{type(exc).__name__}: {exc}"
+                continue
+            shared[name] = SharedMesh(V, F, A)
+        runnable = []
+        for job in jobs:
+            if job["mesh"] in shared:
+                runnable.append(job)
+            else:
+                err = meshes.get(job["mesh"], {}).get("error", "mesh not in manifest")
+                rows.append({"id": job["id"], "mesh": job["mesh"], "mode": job["mode"],
+                             "status": "failed", "error": err, "seconds": 0.0})
+
+        if out_dir is not None:
+            os.makedirs(out_dir, exist_ok=True)
+        descriptors = {name: sm.desc for name, sm in shared.items()}
+        ref_descriptors = {name: sm.desc for name, sm in refs.items()}
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(descriptors, ref_descriptors)) as pool:
+            futures = {pool.submit(_run_job, job, out_dir): job for job in runnable}
+            for fut in as_completed(futures):
+                job = futures[fut]
+                try:
+                    rows.append(fut.result())
+                except Exception as exc:  # worker died (e.g. BrokenProcessPool)
+                    rows.append({"id": job["id"], "mesh": job["mesh"], "mode": job["mode"],
+                                 "status": "failed", "seconds": 0.0,
+                                 "error": f"{type(exc).__name__}: {exc}"})
+    finally:
+        for sm in (*shared.values(), *refs.values()):
+            sm.close()
+
+    order = {job["id"]: i for i, job in enumerate(jobs)}
+    table = pd.DataFrame(rows)
+    table["_order"] = table["id"].map(order)
+    return table.sort_values("_order").drop(columns="_order").reset_index(drop=True)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Batch K/ρ pipeline over many meshes")
+    ap.add_argument("manifest", help="JSON manifest with 'meshes' and 'jobs'")
+    ap.add_argument("--workers", type=int, default=None, help="pool size (default: CPU count)")
+    ap.add_argument("--out", default="outputs/batch_results.csv", help="consolidated results CSV")
+    ap.add_argument("--precision", choices=["double", "compact"], default="double",
+                    help="compact stores V/A/K/ρ as float32 and F as int32 (adds drift_* columns)")
+    ap.add_argument("--fields-dir", default=None, help="also write per-job K_face/ρ .npz files here")
+    args = ap.parse_args()
+
+    meshes, jobs = load_manifest(args.manifest)
+    try:
+        table = run_batch(meshes, jobs, workers=args.workers, out_dir=args.fields_dir,
+                          precision=args.precision)
+    except ValueError as exc:
+        ap.error(str(exc))
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    table.drop(columns=["traceback"], errors="ignore").to_csv(args.out, index=False)
+
+    n_ok = int((table["status"] == "ok").sum())
+    print(f"{n_ok}/{len(table)} jobs ok → {args.out}")
+    for _, row in table[table["status"] != "ok"].iterrows():
+        print(f"  FAILED {row['id']}: {row['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Combinatorial maps stored as NumPy permutation arrays.
+
+A map is kept in flag form: three fixed-point-free involutions r0, r1, r2 on
+flags (vertex, edge, face incidences). r0 changes the vertex, r1 the edge and
+r2 the face, with the other two kept fixed. This also covers non-orientable
+maps, such as most Petrie duals. Oriented permutation triples (darts with a
+face permutation and an edge involution, as built in
+klein_237_generator_sympy.py) convert in O(darts):
+
+    dart d  →  flags 2d   = (tail d, edge d, face left of d)
+               flags 2d+1 = (head d, edge d, face left of d)
+
+All orbit and cycle computations go through labels.component_labels, so
+nothing loops over darts in Python.
+
+Usage:
+    python -m adaptive_pi.combinatorial_map perms.npz --out outputs/map
+    (perms.npz holds integer arrays "face" and "edge" on darts 0..n-1)
+"""
+
+import argparse
+
+import numpy as np
+
+from .labels import compact_labels, component_labels
+from .mesh_io import save_mesh_csv
+
+
+def _check_perm(p, name):
+    p = np.asarray(p, dtype=np.intp)
+    if (p.ndim != 1 or (len(p) and (p.min() < 0 or p.max() >= len(p)))
+            or not np.all(np.bincount(p, minlength=len(p)) == 1)):
+        raise ValueError(f"{name} is not a permutation of 0..{len(p) - 1}")
+    return p
+
+
+def cycle_labels(perm) -> np.ndarray:
+    """Cycle id (0..k-1) of every element of a permutation array."""
+    perm = _check_perm(perm, "perm")
+    ids, _ = compact_labels(component_labels(len(perm), np.arange(len(perm)), perm))
+    return ids
+
+
+def orbit_labels(n: int, gens) -> np.ndarray:
+    """Orbit id (0..k-1) of every point under the group generated by gens."""
+    idx = np.arange(n)
+    u = np.concatenate([idx] * len(gens))
+    v = np.concatenate([np.asarray(g, dtype=np.intp) for g in gens])
+    ids, _ = compact_labels(component_labels(n, u, v))
+    return ids
+
+
+class CombinatorialMap:
+    """Map on flags 0..n-1 given by involutions r0, r1, r2 (see module docstring)."""
+
+    def __init__(self, r0, r1, r2):
+        self.r0 = _check_perm(r0, "r0")
+        self.r1 = _check_perm(r1, "r1")
+        self.r2 = _check_perm(r2, "r2")
+        flags = np.arange(len(self.r0))
+        for name, r in (("r0", self.r0), ("r1", self.r1), ("r2", self.r2)):
+            if len(r) != len(flags) or not np.array_equal(r[r], flags) or np.any(r == flags):
+                raise ValueError(f"{name} must be a fixed-point-free involution")
+        if not np.array_equal(self.r0[self.r2], self.r2[self.r0]):
+            raise ValueError("r0 and r2 must commute")
+        self._cache = {}
+
+    # ------- construction -------
+    @classmethod
+    def from_oriented(cls, face, edge):
+        """
+        From dart permutations: face (next dart around the face to its left)
+        and edge (fixed-point-free involution pairing opposite darts).
+        Vertex rotation is face∘edge, i.e. vertex[d] = face[edge[d]].
+        """
+        face = _check_perm(face, "face")
+        edge = _check_perm(edge, "edge")
+        if len(face) != len(edge):
+            raise ValueError("face and edge must act on the same darts")
+        d = np.arange(len(face))
+        r0 = np.empty(2 * len(d), dtype=np.intp)
+        r1 = np.empty_like(r0)
+        r2 = np.empty_like(r0)
+        r0[2 * d], r0[2 * d + 1] = 2 * d + 1, 2 * d
+        r1[2 * d + 1], r1[2 * face] = 2 * face, 2 * d + 1
+        r2[2 * d], r2[2 * d + 1] = 2 * edge + 1, 2 * edge
+        return cls(r0, r1, r2)
+
+    @classmethod
+    def from_permutations(cls, face, edge, vertex=None):
+        """
+        Permutation triple in the generator script's convention
+        (vertex = edge∘face, vertex[i] = edge[face[i]]). The vertex
+        permutation is implied; if given, it is checked.
+        """
+        face = _check_perm(face, "face")
+        edge = _check_perm(edge, "edge")
+        if vertex is not None and not np.array_equal(_check_perm(vertex, "vertex"), edge[face]):
+            raise ValueError("vertex permutation must equal edge∘face")
+        return cls.from_oriented(face, edge)
+
+    # ------- derived maps -------
+    def dual(self):
+        """Swap vertices and faces."""
+        return CombinatorialMap(self.r2, self.r1, self.r0)
+
+    def petrie_dual(self):
+        """Faces become Petrie polygons (zig-zags); may be non-orientable."""
+        return CombinatorialMap(self.r0[self.r2], self.r1, self.r2)
+
+    # ------- orbits -------
+    def _labels(self, which):
+        if which not in self._cache and which == "edge":
+            # <r0, r2> orbits are the 4-element sets {x, r0 x, r2 x, r0 r2 x}.
+            r0, r2 = self.r0, self.r2
+            flags = np.arange(len(r0))
+            root = np.minimum(np.minimum(flags, r0), np.minimum(r2, r0[r2]))
+            self._cache[which] = compact_labels(root)[0]
+        if which not in self._cache:
+            n = len(self.r0)
+            gens = {
+                "vertex": (self.r1, self.r2),
+                "edge": (self.r0, self.r2),
+                "face": (self.r0, self.r1),
+                "component": (self.r0, self.r1, self.r2),
+                "even": (self.r1[self.r0], self.r2[self.r1]),
+            }[which]
+            self._cache[which] = orbit_labels(n, gens)
+        return self._cache[which]
+
+    def vertex_of_flag(self):
+        return self._labels("vertex")
+
+    def face_of_flag(self):
+        return self._labels("face")
+
+    @property
+    def n_flags(self):
+        return len(self.r0)
+
+    def counts(self):
+        """(V, E, F)."""
+        return tuple(int(self._labels(k).max()) + 1 for k in ("vertex", "edge", "face"))
+
+    def euler_characteristic(self) -> int:
+        V, E, F = self.counts()
+        return V - E + F
+
+    def n_components(self) -> int:
+        return int(self._labels("component").max()) + 1
+
+    def is_orientable(self) -> bool:
+        """Flag graph is bipartite ⇔ r0 always leaves the even-word orbit."""
+        even = self._labels("even")
+        return bool(np.all(even != even[self.r0]))
+
+    def genus(self) -> float:
+        """Orientable genus (2−χ)/2 or non-orientable genus 2−χ, for a connected map."""
+        chi = self.euler_characteristic()
+        return (2 - chi) / 2 if self.is_orientable() else 2 - chi
+
+    def face_degrees(self) -> np.ndarray:
+        return np.bincount(self.face_of_flag()) // 2
+
+    def vertex_degrees(self) -> np.ndarray:
+        return np.bincount(self.vertex_of_flag()) // 2
+
+    # ------- faces / mesh -------
+    def face_cycles(self):
+        """
+        Vertex ids around every face in CSR form: (verts, offsets), face f being
+        verts[offsets[f]:offsets[f+1]]. On orientable maps all faces follow one
+        orientation per component; otherwise each face uses its own.
+        Positions come from pointer-jumping list ranking, O(flags log degree).
+        """
+        face = self.face_of_flag()
+        vert = self.vertex_of_flag()
+        n_faces = int(face.max()) + 1
+        flags = np.arange(self.n_flags)
+        step = self.r1[self.r0]  # walks a face boundary, one orientation per cycle
+        if self.is_orientable():
+            # Pick the even class containing each component's smallest flag;
+            # every face meets it in exactly one r1∘r0 cycle.
+            comp = self._labels("component")
+            root = np.full(int(comp.max()) + 1, self.n_flags, dtype=np.intp)
+            np.minimum.at(root, comp, flags)
+            even = self._labels("even")
+            on = even == even[root[comp]]
+            start = np.full(n_faces, self.n_flags, dtype=np.intp)
+            np.minimum.at(start, face[on], flags[on])
+        else:
+            start = np.full(n_faces, self.n_flags, dtype=np.intp)
+            np.minimum.at(start, face, flags)
+            walk = cycle_labels(step)
+            on = walk == walk[start[face]]
+        deg = self.face_degrees()
+
+        # Distance from each flag to the last flag before returning to start.
+        last = step == start[face]
+        ptr = np.where(last, flags, step)
+        dist = np.where(last, 0, 1)
+        for _ in range(int(deg.max()).bit_length()):
+            dist = dist + dist[ptr]
+            ptr = ptr[ptr]
+        offsets = np.concatenate([[0], np.cumsum(deg)])
+        verts = np.empty(int(offsets[-1]), dtype=np.intp)
+        verts[offsets[face[on]] + deg[face[on]] - 1 - dist[on]] = vert[on]
+        return verts, offsets
+
+    def to_mesh(self):
+        """
+        Triangle faces (fan per face) over vertex ids 0..V-1.
+        Returns (F (m,3) int, face_of_triangle (m,) int).
+        """
+        verts, offsets = self.face_cycles()
+        deg = np.diff(offsets)
+        owner = np.repeat(np.arange(len(deg)), np.maximum(deg - 2, 0))
+        # local corner j = 1..deg-2 of each owning face
+        j = np.arange(len(owner)) - np.repeat(np.cumsum(np.maximum(deg - 2, 0)) - np.maximum(deg - 2, 0),
+                                               np.maximum(deg - 2, 0)) + 1
+        base = offsets[owner]
+        F = np.stack([verts[base], verts[base + j], verts[base + j + 1]], axis=1)
+        return F, owner
+
+    def summary(self) -> dict:
+        V, E, F = self.counts()
+        return {"V": V, "E": E, "F": F, "chi": V - E + F,
+                "orientable": self.is_orientable(), "components": self.n_components()}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Permutation triple → mesh CSVs and V/E/F/χ")
+    ap.add_argument("perms", help=".npz with integer arrays 'face' and 'edge' on darts")
+    ap.add_argument("--dual", action="store_true", help="use the dual map")
+    ap.add_argument("--petrie", action="store_true", help="use the Petrie dual")
+    ap.add_argument("--out", default=None, help="CSV prefix for faces (and circle placeholder vertices)")
+    args = ap.parse_args()
+
+    with np.load(args.perms) as z:
+        cmap = CombinatorialMap.from_oriented(z["face"], z["edge"])
+    if args.petrie:
+        cmap = cmap.petrie_dual()
+    if args.dual:
+        cmap = cmap.dual()
+    print(cmap.summary())
+    if args.out:
+        F, _ = cmap.to_mesh()
+        V_n = cmap.counts()[0]
+        ang = 2 * np.pi * np.arange(V_n) / V_n
+        save_mesh_csv(args.out, 0.92 * np.column_stack([np.cos(ang), np.sin(ang)]), F)
+
+
+if __name__ == "__main__":
+    main()
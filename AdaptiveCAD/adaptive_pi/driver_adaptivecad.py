@@ -9,14 +9,17 @@ AdaptiveCAD driver (PNG-only):
 Wire the 'KernelAdapter' methods to your AdaptiveCAD kernel.
 """
 
-import os
 import math
 import argparse
 import numpy as np
-import matplotlib.pyplot as plt
-from typing import Callable, Dict, Tuple
+from typing import Callable, Optional, Tuple
 
-from .solve_curvature import solve_K_hyperbolic, solve_K_spherical, rho_exact
+from .solve_curvature import solve_K_hyperbolic, solve_K_spherical
+from .result_cache import ResultCache, cache_key, restore_pngs
+from .render_pool import RenderPool, render_face_png
+from .precision import cast_mesh, drift_report, gb_sum
+from .mesh_io import Mesh
+from .rho_series import rho_adaptive
 
 # ------- 0) Replace this shim with your real AdaptiveCAD API calls -------
 class KernelAdapter:
@@ -62,24 +65,15 @@ class KernelAdapter:
         m.V, m.F, m.A = V, F, A
         return m
 
-    def render_face_scalar(self, mesh, values: np.ndarray, title: str, outfile: str):
+    def render_face_scalar(self, mesh, values: np.ndarray, title: str, outfile: str,
+                           pool: Optional[RenderPool] = None, cbar_label: str = "K (curvature)"):
         """
         Render a flat PNG of per-face scalar (heatmap-ish). Replace with your renderer.
+        With a RenderPool the PNG is encoded in the background and a Future is returned.
         """
-        # Quick barycenter scatter with triangulation outline
-        V, F = mesh.V, mesh.F
-        bary = V[F].mean(axis=1)
-        fig, ax = plt.subplots(figsize=(7,5))
-        t = ax.tripcolor(V[:,0], V[:,1], F, facecolors=values, shading='flat')
-        ax.triplot(V[:,0], V[:,1], F, linewidth=0.2)
-        ax.set_aspect('equal'); ax.axis('off')
-        cbar = plt.colorbar(t, ax=ax)
-        cbar.set_label("K (curvature)")
-        ax.set_title(title)
-        fig.tight_layout()
-        os.makedirs(os.path.dirname(outfile), exist_ok=True)
-        fig.savefig(outfile, dpi=220, bbox_inches="tight")
-        plt.close(fig)
+        if pool is not None:
+            return pool.submit(mesh.V, mesh.F, values, outfile, title, cbar_label)
+        return render_face_png(mesh.V, mesh.F, values, outfile, title, cbar_label)
 
 # ------- 1) Choose your rho(x) and (r_v, r_f) maps -------
 def constant_field(value: float) -> Callable[[np.ndarray], float]:
@@ -105,28 +99,31 @@ def solve_per_face_K(mesh, rho_fn, scales_fn, branch="hyperbolic"):
     """
     V, F = mesh.V, mesh.F
     bary = V[F].mean(axis=1)
-    K = np.zeros(len(F), dtype=float)
+    K = np.zeros(len(F), dtype=mesh.A.dtype)
 
     for idx, p in enumerate(bary):
-        rho = rho_fn(p)
         r_v, r_f = scales_fn(p)
-        if branch == "hyperbolic":
-            k = solve_K_hyperbolic(rho=rho, r_v=r_v, r_f=r_f)
-        else:
-            k = solve_K_spherical(rho=rho, r_v=r_v, r_f=r_f)
-        if k is None or (branch == "hyperbolic" and k >= 0) or (branch == "spherical" and k <= 0):
-            # fallback to small-r linearization (first order)
-            # K ≈ 6(ρ-1)/(r_f^2 - r_v^2)
-            denom = (r_f*r_f - r_v*r_v)
-            if abs(denom) < 1e-12:
-                k = -1.0 if branch == "hyperbolic" else +1.0
-            else:
-                k = 6.0 * (rho - 1.0) / denom
-                if branch == "hyperbolic": k = min(k, -1e-6)
-                else: k = max(k, 1e-6)
-        K[idx] = k
+        K[idx] = solve_face_K(rho_fn(p), r_v, r_f, branch)
     return K
 
+def solve_face_K(rho: float, r_v: float, r_f: float, branch="hyperbolic") -> float:
+    """K for one face from ρ and (r_v, r_f), with the first-order fallback."""
+    if branch == "hyperbolic":
+        k = solve_K_hyperbolic(rho=rho, r_v=r_v, r_f=r_f)
+    else:
+        k = solve_K_spherical(rho=rho, r_v=r_v, r_f=r_f)
+    if k is None or (branch == "hyperbolic" and k >= 0) or (branch == "spherical" and k <= 0):
+        # fallback to small-r linearization (first order)
+        # K ≈ 6(ρ-1)/(r_f^2 - r_v^2)
+        denom = (r_f*r_f - r_v*r_v)
+        if abs(denom) < 1e-12:
+            k = -1.0 if branch == "hyperbolic" else +1.0
+        else:
+            k = 6.0 * (rho - 1.0) / denom
+            if branch == "hyperbolic": k = min(k, -1e-6)
+            else: k = max(k, 1e-6)
+    return k
+
 # ------- 3) Enforce Gauss–Bonnet for genus 3 -------
 def gauss_bonnet_normalize(mesh, K_face: np.ndarray, target_chi: int = -4) -> np.ndarray:
     """
@@ -134,7 +131,7 @@ def gauss_bonnet_normalize(mesh, K_face: np.ndarray, target_chi: int = -4) -> np
     For genus g=3, χ = 2 - 2g = -4 → target integral = -8π.
     """
     A = mesh.A
-    current = float((K_face * A).sum())
+    current = gb_sum(K_face, A)
     target = 2.0 * math.pi * float(target_chi)
     if abs(current) < 1e-14:
         return K_face
@@ -170,30 +167,63 @@ def rho_from_K(point, K_of_point, mode="tempered", r_v=1.0, r_f=0.8, c=None):
             return num / den
 
 # ------- 4) CLI-style main -------
-def main():
-    parser = argparse.ArgumentParser(description="AdaptiveCAD driver (PNG-only)")
-    parser.add_argument(
-        "--mode",
-        choices=["tempered", "exact"],
-        default="tempered",
-        help="ρ recovery mode from curvature",
-    )
-    parser.add_argument(
-        "--rho",
-        type=float,
-        default=1.7,
-        help="constant ρ for the mesh (must lie in [1.3, 2.4])",
-    )
-    args = parser.parse_args()
+# Recovery parameters for ρ from K
+R_V, R_F = 2.09, 0.8
+C_CONST = -0.623
 
-    if not (1.3 <= args.rho <= 2.4):
-        parser.error("--rho must be in [1.3, 2.4]")
+def recover_rho(mesh, K_face, mode, rho_tol=1e-10):
+    """
+    ρ per face from K_face via rho_from_K with the recovery parameters above.
+    mode="adaptive" agrees with "exact" to within rho_tol (series where the
+    truncation bound allows it) and prints the series/exact split.
+    """
+    if mode == "adaptive":
+        rho, info = rho_adaptive(K_face, R_V, R_F, rho_tol)
+        print(f"adaptive ρ: {info['series_faces']} series / {info['exact_faces']} exact faces, "
+              f"max error bound {info['max_error_bound']:.3g}")
+        return rho
+    # ρ depends on K alone, so no barycenters are needed here.
+    return np.array(
+        [
+            rho_from_K(
+                None,
+                lambda _p, k=k: k,
+                mode=mode,
+                r_v=R_V,
+                r_f=R_F,
+                c=C_CONST,
+            )
+            for k in K_face
+        ],
+        K_face.dtype,
+    )
 
-    ka = KernelAdapter()
-    mesh = ka.load_genus3_mesh()
+def run_config(ka, mesh, rho, mode, K_png, rho_png, pool=None, cache=None, ref_mesh=None,
+               rho_tol=1e-10):
+    """
+    Solve/normalise/recover for one constant ρ and submit both heatmaps.
+    With ref_mesh (a float64 copy of a compact mesh) the same pipeline is rerun
+    in double precision and the K/ρ drift is printed.
+    Returns a deferred cache entry (key, fields, stats, pngs) to store once the
+    renders have finished, or None on a cache hit / without a cache.
+    """
+    key = None
+    if cache is not None:
+        key = cache_key(
+            {"V": mesh.V, "F": mesh.F, "A": mesh.A},
+            {"pipeline": "driver_adaptivecad", "field": ["constant", rho],
+             "scales": [1.0, 0.8], "branch": "hyperbolic", "target_chi": -4,
+             "mode": mode, "r_v": R_V, "r_f": R_F, "c": C_CONST,
+             "precision": str(mesh.V.dtype),
+             "rho_tol": rho_tol if mode == "adaptive" else None},
+        )
+        hit = cache.get(key)
+        if hit is not None and restore_pngs(hit, {"K": K_png, "rho": rho_png}):
+            print("Cache hit:", K_png, rho_png)
+            return None
 
-    # Pick your field: constant ρ(x) provided via CLI.
-    rho_fn = constant_field(args.rho)
+    # Pick your field: constant ρ(x).
+    rho_fn = constant_field(rho)
     # Scales: typical choice for hyperbolic branch: r_v=1.0, r_f=0.8
     scales_fn = constant_scales(r_v=1.0, r_f=0.8)
 
@@ -203,38 +233,134 @@ def main():
     # Enforce Gauss–Bonnet for g=3 → χ=-4
     K_face = gauss_bonnet_normalize(mesh, K_face, target_chi=-4)
 
-    # Render PNG heatmap of curvature
+    # Render PNG heatmap of curvature (overlaps the ρ recovery below when pooled)
     ka.render_face_scalar(
         mesh,
         K_face,
         title="Adaptive-π: per-face K (g=3, {3,7})",
-        outfile="outputs/adaptive_pi_K_genus3.png",
+        outfile=K_png,
+        pool=pool,
     )
 
     # Example: recover ρ from K using selected mode
-    R_V, R_F = 2.09, 0.8
-    C_CONST = -0.623
-    bary = mesh.V[mesh.F].mean(axis=1)
-    rho_faces = np.array(
-        [
-            rho_from_K(
-                p,
-                lambda _p, k=K_face[idx]: k,
-                mode=args.mode,
-                r_v=R_V,
-                r_f=R_F,
-                c=C_CONST,
-            )
-            for idx, p in enumerate(bary)
-        ]
-    )
+    rho_faces = recover_rho(mesh, K_face, mode, rho_tol)
     ka.render_face_scalar(
         mesh,
         rho_faces,
         title="Adaptive-π: ρ from K",
-        outfile="outputs/adaptive_pi_rho_genus3.png",
+        outfile=rho_png,
+        pool=pool,
     )
 
+    if ref_mesh is not None:
+        K_ref = gauss_bonnet_normalize(
+            ref_mesh, solve_per_face_K(ref_mesh, rho_fn, scales_fn, branch="hyperbolic"),
+            target_chi=-4,
+        )
+        drift = drift_report(
+            {"K_face": K_ref, "rho": recover_rho(ref_mesh, K_ref, mode, rho_tol)},
+            {"K_face": K_face, "rho": rho_faces},
+        )
+        print(f"ρ={rho:g} precision drift vs float64:",
+              ", ".join(f"{k} max_abs={v['max_abs']:.3g} max_rel={v['max_rel']:.3g}"
+                        for k, v in drift.items()))
+
+    if cache is None:
+        return None
+    stats = {
+        "GB_sum_KA": gb_sum(K_face, mesh.A),
+        "K_min": float(K_face.min()),
+        "K_max": float(K_face.max()),
+        "rho_min": float(rho_faces.min()),
+        "rho_max": float(rho_faces.max()),
+    }
+    return key, {"K_face": K_face, "rho": rho_faces}, stats, {"K": K_png, "rho": rho_png}
+
+def main():
+    parser = argparse.ArgumentParser(description="AdaptiveCAD driver (PNG-only)")
+    parser.add_argument(
+        "--mode",
+        choices=["tempered", "exact", "adaptive"],
+        default="tempered",
+        help="ρ recovery mode from curvature",
+    )
+    parser.add_argument(
+        "--rho-tol",
+        type=float,
+        default=1e-10,
+        help="absolute ρ tolerance for --mode adaptive (series where accurate, sinh/sin elsewhere)",
+    )
+    parser.add_argument(
+        "--rho",
+        type=float,
+        nargs="+",
+        default=[1.7],
+        help="constant ρ for the mesh (must lie in [1.3, 2.4]); several values run a sweep",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="reuse K/ρ results and PNGs from this content-addressed cache",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=256.0,
+        help="LRU eviction budget for --cache-dir (MiB)",
+    )
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        default=2,
+        help="background PNG render processes (0 renders inline)",
+    )
+    parser.add_argument(
+        "--max-pending-renders",
+        type=int,
+        default=None,
+        help="block the next solve once this many PNGs are queued (default 2×workers)",
+    )
+    parser.add_argument(
+        "--precision",
+        choices=["double", "compact"],
+        default="double",
+        help="compact: float32 V/A/K/ρ and int32 F (GB sums stay float64); reports drift",
+    )
+    args = parser.parse_args()
+
+    for rho in args.rho:
+        if not (1.3 <= rho <= 2.4):
+            parser.error("--rho must be in [1.3, 2.4]")
+
+    ka = KernelAdapter()
+    mesh = ka.load_genus3_mesh()
+    ref_mesh = None
+    if args.precision != "double":
+        ref_mesh = mesh
+        mesh = Mesh(*cast_mesh(mesh.V, mesh.F, mesh.A, args.precision))
+    cache = None
+    if args.cache_dir:
+        cache = ResultCache(args.cache_dir, int(args.cache_max_mb * 2**20))
+
+    deferred = []
+    with RenderPool(args.render_workers, args.max_pending_renders) as pool:
+        for rho in args.rho:
+            suffix = "" if len(args.rho) == 1 else f"_rho{rho:g}"
+            entry = run_config(
+                ka, mesh, rho, args.mode,
+                K_png=f"outputs/adaptive_pi_K_genus3{suffix}.png",
+                rho_png=f"outputs/adaptive_pi_rho_genus3{suffix}.png",
+                pool=pool,
+                cache=cache,
+                ref_mesh=ref_mesh,
+                rho_tol=args.rho_tol,
+            )
+            if entry is not None:
+                deferred.append(entry)
+    # Renders have completed (errors re-raised by the pool); now cache the PNGs.
+    for key, fields, stats, pngs in deferred:
+        cache.put(key, fields, stats, pngs=pngs)
+
 
 if __name__ == "__main__":
     main()
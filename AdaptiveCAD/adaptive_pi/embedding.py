@@ -0,0 +1,282 @@
+"""
+Geometric embeddings for meshes that only carry connectivity (e.g. the
+placeholder circle coordinates of klein_vertices.csv).
+
+- tutte_layout: harmonic (Tutte) map of a disk-type mesh. The boundary loop is
+  pinned to the unit circle and the interior is solved by matrix-free
+  conjugate gradients over the edge arrays.
+- circle_packing: hyperbolic circle-packing radii (every interior angle sum
+  = 2π) by Jacobi sweeps of the Collins–Stephenson uniform-neighbour update.
+  On closed surfaces with χ < 0 every vertex is interior. The radii give
+  edge lengths r_i + r_j, so face areas and Gauss–Bonnet checks become
+  geometric even before a layout exists.
+- layout_packing: develops a packing into the Poincaré disk face by face
+  along a breadth-first dual spanning tree (one vectorised step per layer).
+
+Every iterative solver returns its residual history for convergence checks.
+
+Usage:
+    python -m adaptive_pi.embedding klein --method packing --out outputs/klein_packed
+    python -m adaptive_pi.embedding outputs/tiling_7_3 --method tutte --out outputs/tiling_tutte
+"""
+
+import argparse
+import math
+from pathlib import Path
+
+import numpy as np
+
+from .mesh_io import REPO_ROOT, face_areas, load_mesh_csv, save_mesh_csv
+
+
+# ------- 0) Connectivity helpers -------
+def mesh_edges(F: np.ndarray):
+    """
+    Unique undirected edges and the faces on each side.
+    Returns (E (m,2) sorted pairs, edge_of_halfedge (3·nf,), face_count (m,)).
+    Half-edge h = 3·f + k runs F[f,k] → F[f,(k+1)%3].
+    """
+    he = np.stack([F, np.roll(F, -1, axis=1)], axis=2).reshape(-1, 2)
+    n = int(F.max()) + 1
+    key = np.minimum(he[:, 0], he[:, 1]).astype(np.int64) * n + np.maximum(he[:, 0], he[:, 1])
+    ukey, inv, cnt = np.unique(key, return_inverse=True, return_counts=True)
+    E = np.column_stack([ukey // n, ukey % n])
+    return E, inv.ravel(), cnt
+
+
+def boundary_loop(F: np.ndarray, edges=None) -> np.ndarray:
+    """
+    Vertices of the (single) boundary loop in order, following face
+    orientation. `edges` may pass a precomputed mesh_edges(F).
+    """
+    E, inv, cnt = mesh_edges(F) if edges is None else edges
+    he = np.stack([F, np.roll(F, -1, axis=1)], axis=2).reshape(-1, 2)
+    bnd = he[cnt[inv] == 1]
+    if len(bnd) == 0:
+        return np.zeros(0, dtype=np.intp)
+    nxt = np.full(int(F.max()) + 1, -1, dtype=np.intp)
+    nxt[bnd[:, 0]] = bnd[:, 1]
+    loop = [int(bnd[0, 0])]
+    for _ in range(len(bnd) - 1):
+        loop.append(int(nxt[loop[-1]]))
+    if nxt[loop[-1]] != loop[0] or len(set(loop)) != len(bnd):
+        raise ValueError("boundary is not a single simple loop; pass `pinned` explicitly")
+    return np.array(loop, dtype=np.intp)
+
+
+# ------- 1) Tutte / harmonic layout -------
+def tutte_layout(F, pinned=None, pinned_xy=None, tol=1e-10, max_iter=20000):
+    """
+    Uniform-weight Tutte embedding: every free vertex at the mean of its
+    neighbours, pinned vertices fixed (default: boundary loop on the unit
+    circle, spaced by index). Solved with CG on the graph Laplacian.
+    Returns (xy (n,2), history of relative residual norms).
+    """
+    F = np.asarray(F, dtype=np.intp)
+    n = int(F.max()) + 1
+    edges = mesh_edges(F)
+    E = edges[0]
+    if pinned is None:
+        pinned = boundary_loop(F, edges)
+        if len(pinned) == 0:
+            raise ValueError("closed mesh: Tutte needs a pinned loop (or use circle_packing)")
+        t = 2.0 * np.pi * np.arange(len(pinned)) / len(pinned)
+        pinned_xy = np.column_stack([np.cos(t), np.sin(t)])
+    pinned = np.asarray(pinned, dtype=np.intp)
+
+    xy = np.zeros((n, 2))
+    xy[pinned] = pinned_xy
+    free = np.ones(n, dtype=bool)
+    free[pinned] = False
+    deg = np.bincount(E.ravel(), minlength=n).astype(float)
+    i, j = E[:, 0], E[:, 1]
+
+    def neighbour_sum(x):
+        """Σ_{j ~ i} x_j per vertex, one bincount per coordinate."""
+        return np.column_stack([
+            np.bincount(i, weights=x[j, c], minlength=n) + np.bincount(j, weights=x[i, c], minlength=n)
+            for c in range(x.shape[1])
+        ])
+
+    def laplace(x):
+        """L x restricted to free rows, with pinned entries of x treated as 0."""
+        x = np.where(free[:, None], x, 0.0)
+        y = deg[:, None] * x - neighbour_sum(x)
+        y[~free] = 0.0
+        return y
+
+    # L_ff x_f = -L_fp x_p  → right-hand side from pinned neighbours.
+    b = neighbour_sum(np.where(free[:, None], 0.0, xy))
+    b[~free] = 0.0
+
+    x = np.zeros((n, 2))
+    r = b - laplace(x)
+    p = r.copy()
+    rs = (r * r).sum(axis=0)
+    b_norm = np.sqrt((b * b).sum()) or 1.0
+    history = []
+    for _ in range(max_iter):
+        res = math.sqrt(rs.sum()) / b_norm
+        history.append(res)
+        if res < tol:
+            break
+        Ap = laplace(p)
+        alpha = rs / np.maximum((p * Ap).sum(axis=0), 1e-300)
+        x += alpha * p
+        r -= alpha * Ap
+        rs_new = (r * r).sum(axis=0)
+        p = r + (rs_new / np.maximum(rs, 1e-300)) * p
+        rs = rs_new
+    xy[free] = x[free]
+    return xy, np.array(history)
+
+
+# ------- 2) Hyperbolic circle packing -------
+def _corner_angles(F, r):
+    """Angle at each corner of each face for tangent circles of hyperbolic radii r."""
+    ra, rb, rc = r[F[:, 0]], r[F[:, 1]], r[F[:, 2]]
+    ab, bc, ca = ra + rb, rb + rc, rc + ra
+
+    def angle(s1, s2, opp):
+        cos_t = (np.cosh(s1) * np.cosh(s2) - np.cosh(opp)) / (np.sinh(s1) * np.sinh(s2))
+        return np.arccos(np.clip(cos_t, -1.0, 1.0))
+
+    return np.stack([angle(ab, ca, bc), angle(ab, bc, ca), angle(bc, ca, ab)], axis=1)
+
+
+def circle_packing(F, boundary_radius=2.0, tol=1e-9, max_iter=20000, r0=None):
+    """
+    Hyperbolic radii with angle sum 2π at every interior vertex. Boundary
+    vertices (if any) keep `boundary_radius`. Returns (r, history of max
+    |angle sum − 2π|).
+    """
+    F = np.asarray(F, dtype=np.intp)
+    n = int(F.max()) + 1
+    bnd = boundary_loop(F)
+    interior = np.ones(n, dtype=bool)
+    interior[bnd] = False
+    k = np.bincount(F.ravel(), minlength=n).astype(float)  # faces per vertex
+    r = np.full(n, 0.5) if r0 is None else np.array(r0, dtype=float)
+    r[bnd] = boundary_radius
+
+    delta = np.sin(np.pi / np.maximum(k, 1.0))
+    history = []
+    for _ in range(max_iter):
+        theta = np.bincount(F.ravel(), weights=_corner_angles(F, r).ravel(), minlength=n)
+        err = np.abs(theta - 2.0 * np.pi)[interior]
+        history.append(float(err.max()) if err.size else 0.0)
+        if history[-1] < tol:
+            break
+        # Uniform-neighbour model: find the common neighbour radius ρ that
+        # reproduces θ, then the radius whose flower closes with that ρ.
+        beta = np.sin(theta / (2.0 * k))
+        denom = 1.0 - beta * np.cosh(r)
+        tanh_rho = np.where(denom > 0, beta * np.sinh(r) / np.where(denom > 0, denom, 1.0), 1.0)
+        ok = interior & (tanh_rho < 1.0 - 1e-15)
+        rho = np.arctanh(np.clip(tanh_rho, 0.0, 1.0 - 1e-15))
+        r_new = np.arcsinh(np.sinh(rho) / delta) - rho
+        # Neighbours effectively infinite (angle sum far too large): grow r.
+        r_new = np.where(ok, r_new, r * 2.0)
+        r[interior] = np.maximum(r_new[interior], 1e-12)
+    return r, np.array(history)
+
+
+def packing_face_areas(F, r):
+    """Hyperbolic face areas π − (angle sum) for the packing radii r."""
+    return np.pi - _corner_angles(np.asarray(F, dtype=np.intp), r).sum(axis=1)
+
+
+def layout_packing(F, r):
+    """
+    Develop the packing into the Poincaré disk along a BFS dual spanning tree.
+    Returns (corner_z (nf,3) complex per-face corners, vertex_z (n,) complex
+    with each vertex at its first placement). On disk-type meshes both agree;
+    on closed surfaces corner_z is the cut-open development.
+    """
+    F = np.asarray(F, dtype=np.intp)
+    nf = len(F)
+    n = int(F.max()) + 1
+    ang = _corner_angles(F, r)
+    E, inv, cnt = mesh_edges(F)
+
+    # Dual adjacency through interior edges: half-edge pairs sharing an edge id.
+    order = np.argsort(inv, kind="stable")
+    pair_ok = cnt[inv[order[:-1]]] == 2
+    same = (inv[order[:-1]] == inv[order[1:]]) & pair_ok
+    h1, h2 = order[:-1][same], order[1:][same]
+    nbr_h = np.concatenate([h1, h2])      # half-edge in placed parent
+    nbr_c = np.concatenate([h2, h1])      # matching half-edge in child
+
+    corner = np.full((nf, 3), np.nan + 0j)
+    placed = np.zeros(nf, dtype=bool)
+    # Seed face 0: v0 at the origin, v1 on the positive real axis.
+    a, b = F[0, 0], F[0, 1]
+    corner[0, 0] = 0.0
+    corner[0, 1] = math.tanh((r[a] + r[b]) / 2.0)
+    corner[0, 2] = math.tanh((r[a] + r[F[0, 2]]) / 2.0) * np.exp(1j * ang[0, 0])
+    placed[0] = True
+    frontier = np.array([0])
+    while len(frontier):
+        in_front = np.zeros(nf, dtype=bool)
+        in_front[frontier] = True
+        sel = in_front[nbr_h // 3] & ~placed[nbr_c // 3]
+        ph, ch = nbr_h[sel], nbr_c[sel]
+        child = ch // 3
+        child, first = np.unique(child, return_index=True)
+        ph, ch = ph[first], ch[first]
+        if len(child) == 0:
+            break
+        pf, pk = ph // 3, ph % 3
+        ck = ch % 3
+        # Parent half-edge u→v is child half-edge v→u: child corner ck sits at v.
+        z_v = corner[pf, (pk + 1) % 3]
+        z_u = corner[pf, pk]
+        c_third = (ck + 2) % 3
+        # Place the third vertex from corner v (child corner ck), rotating
+        # from the direction of u by the child's angle at v (ccw).
+        lv = r[F[child, ck]] + r[F[child, c_third]]
+        w_u = (z_u - z_v) / (1.0 - np.conj(z_v) * z_u)
+        w_c = np.tanh(lv / 2.0) * (w_u / np.abs(w_u)) * np.exp(1j * ang[child, ck])
+        z_c = (w_c + z_v) / (1.0 + np.conj(z_v) * w_c)
+        corner[child, ck] = z_v
+        corner[child, (ck + 1) % 3] = z_u
+        corner[child, c_third] = z_c
+        placed[child] = True
+        frontier = child
+
+    vertex_z = np.full(n, np.nan + 0j)
+    flat_v = F[placed].ravel()[::-1]
+    vertex_z[flat_v] = corner[placed].ravel()[::-1]
+    return corner, vertex_z
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Embed a connectivity-only mesh")
+    ap.add_argument("prefix", help="mesh CSV prefix (relative to the repo root or a path)")
+    ap.add_argument("--method", choices=["tutte", "packing"], default="packing")
+    ap.add_argument("--boundary-radius", type=float, default=2.0,
+                    help="hyperbolic radius kept on boundary vertices (packing)")
+    ap.add_argument("--tol", type=float, default=1e-9)
+    ap.add_argument("--max-iter", type=int, default=20000)
+    ap.add_argument("--out", required=True, help="output CSV prefix")
+    args = ap.parse_args()
+
+    root = "." if Path(f"{args.prefix}_vertices.csv").is_file() else REPO_ROOT
+    V, F, _ = load_mesh_csv(args.prefix, root)
+    if args.method == "tutte":
+        xy, hist = tutte_layout(F, tol=args.tol, max_iter=args.max_iter)
+        A = face_areas(np.column_stack([xy, np.zeros(len(xy))]), F)
+    else:
+        r, hist = circle_packing(F, args.boundary_radius, args.tol, args.max_iter)
+        _, z = layout_packing(F, r)
+        xy = np.column_stack([z.real, z.imag])
+        A = packing_face_areas(F, r)
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        np.savetxt(f"{args.out}_radii.csv", r, delimiter=",", header="r_hyp", comments="")
+    save_mesh_csv(args.out, xy, F, A)
+    print({"method": args.method, "iterations": len(hist), "final_residual": float(hist[-1]),
+           "area_sum": float(A.sum())})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Vectorised gluing of a fundamental polygon by an edge pairing.
+
+Generalises klein_domain_chi_from_pairings.py and the identification step of
+klein_14gon_sympy_builder.py. Any N-gon with any pairing works (opposite
+edges, surface words such as a1 b1 a1⁻¹ b1⁻¹ … for genus g, or explicit
+pair arrays). Corner classes come from labels.component_labels, and the
+quotient fan mesh is deduplicated with np.unique on integer face keys.
+
+Edge i of the polygon runs corner i → corner i+1 (mod N).
+
+Usage:
+    python -m adaptive_pi.gluing --opposite 14          # the Klein 14-gon (χ = −4)
+    python -m adaptive_pi.gluing --genus 100000         # standard 4g-gon word
+    python -m adaptive_pi.gluing --word "1 2 -1 -2"     # torus
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from .labels import compact_labels, component_labels
+
+
+# ------- 1) Pairing specifications -------
+def opposite_pairing(n: int):
+    """i ↔ i + n/2 with reverse orientation (the 14-gon scripts' rule)."""
+    if n % 2:
+        raise ValueError("opposite pairing needs an even number of edges")
+    a = np.arange(n // 2)
+    return a, a + n // 2, np.ones(n // 2, dtype=bool)
+
+
+def standard_word(g: int) -> np.ndarray:
+    """a1 b1 a1⁻¹ b1⁻¹ … ag bg ag⁻¹ bg⁻¹ as signed labels (+k / −k), length 4g."""
+    k = np.arange(g)
+    a, b = 2 * k + 1, 2 * k + 2
+    return np.stack([a, b, -a, -b], axis=1).ravel()
+
+
+def word_pairing(word):
+    """
+    Signed edge labels → (edge_a, edge_b, reverse). Every |label| must occur
+    exactly twice. Opposite signs glue with reversed orientation (orientable);
+    equal signs glue directly (e.g. "1 1" is the projective plane).
+    """
+    word = np.asarray(word, dtype=np.int64)
+    if np.any(word == 0):
+        raise ValueError("labels must be non-zero")
+    lab = np.abs(word)
+    order = np.argsort(lab, kind="stable")
+    sl = lab[order]
+    if len(word) % 2 or np.any(sl[0::2] != sl[1::2]) or np.any(sl[2::2] == sl[1:-1:2]):
+        raise ValueError("every edge label must appear exactly twice")
+    ea, eb = order[0::2], order[1::2]
+    reverse = np.sign(word[ea]) != np.sign(word[eb])
+    return ea, eb, reverse
+
+
+# ------- 2) Gluing -------
+def corner_classes(n: int, edge_a, edge_b, reverse) -> np.ndarray:
+    """Vertex class (0..V-1) of every polygon corner after the identifications."""
+    ea = np.asarray(edge_a, dtype=np.intp)
+    eb = np.asarray(edge_b, dtype=np.intp)
+    rev = np.asarray(reverse, dtype=bool)
+    if len(np.unique(np.concatenate([ea, eb]))) != n or 2 * len(ea) != n:
+        raise ValueError("each polygon edge must be paired exactly once")
+    a0, a1 = ea, (ea + 1) % n
+    b0, b1 = eb, (eb + 1) % n
+    # reversed: a0 ~ b1, a1 ~ b0; direct: a0 ~ b0, a1 ~ b1
+    u = np.concatenate([a0, a1])
+    v = np.concatenate([np.where(rev, b1, b0), np.where(rev, b0, b1)])
+    ids, _ = compact_labels(component_labels(n, u, v))
+    return ids
+
+
+def glue_polygon(n: int, edge_a, edge_b, reverse) -> dict:
+    """V/E/F/χ of the closed surface from one N-gon and its edge pairing."""
+    cls = corner_classes(n, edge_a, edge_b, reverse)
+    V = int(cls.max()) + 1
+    E = n // 2
+    chi = V - E + 1
+    orientable = bool(np.all(reverse))
+    genus = (2 - chi) // 2 if orientable else 2 - chi
+    return {"V": V, "E": E, "F": 1, "chi": chi, "orientable": orientable, "genus": genus}
+
+
+def quotient_fan_mesh(n: int, cls: np.ndarray):
+    """
+    Fan-triangulate the polygon from an added centre vertex, map corners to
+    their classes and drop duplicate faces (same vertex set), keeping the
+    first occurrence in its original orientation, as klein_14gon_sympy_builder
+    does. Returns (F (m,3), counts dict with V/E/F/χ of the fan mesh).
+    """
+    V = int(cls.max()) + 2  # classes plus the centre
+    centre = V - 1
+    i = np.arange(n)
+    tri = np.stack([np.full(n, centre), cls[i], cls[(i + 1) % n]], axis=1).astype(np.int64)
+
+    key_sorted = np.sort(tri, axis=1)
+    key = (key_sorted[:, 0] * V + key_sorted[:, 1]) * V + key_sorted[:, 2]
+    _, first = np.unique(key, return_index=True)
+    F = tri[np.sort(first)]
+
+    e = np.sort(np.concatenate([F[:, [0, 1]], F[:, [1, 2]], F[:, [2, 0]]]), axis=1)
+    n_e = len(np.unique(e[:, 0] * V + e[:, 1]))
+    return F, {"V": V, "E": n_e, "F": len(F), "chi": V - n_e + len(F)}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Glue a fundamental polygon; report V/E/F/χ")
+    spec = ap.add_mutually_exclusive_group(required=True)
+    spec.add_argument("--opposite", type=int, metavar="N", help="N-gon with i ↔ i+N/2 reversed")
+    spec.add_argument("--genus", type=int, metavar="G", help="standard 4g-gon word a b a⁻¹ b⁻¹ …")
+    spec.add_argument("--word", type=str, help='signed labels, e.g. "1 2 -1 -2"')
+    ap.add_argument("--fan", action="store_true", help="also report the quotient fan mesh counts")
+    args = ap.parse_args()
+
+    if args.genus is not None and args.genus < 1:
+        ap.error("--genus must be at least 1")
+    if args.opposite is not None and args.opposite < 2:
+        ap.error("--opposite needs at least 2 edges")
+    if args.word is not None and not args.word.split():
+        ap.error("--word must not be empty")
+
+    t0 = time.perf_counter()
+    try:
+        if args.opposite is not None:
+            n = args.opposite
+            ea, eb, rev = opposite_pairing(n)
+        else:
+            word = standard_word(args.genus) if args.genus is not None else [int(t) for t in args.word.split()]
+            n = len(word)
+            ea, eb, rev = word_pairing(word)
+    except ValueError as exc:
+        ap.error(str(exc))
+    summary = glue_polygon(n, ea, eb, rev)
+    if args.fan:
+        _, summary["fan_mesh"] = quotient_fan_mesh(n, corner_classes(n, ea, eb, rev))
+    summary["seconds"] = round(time.perf_counter() - t0, 4)
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Hyperbolic {p,q} tessellations of the Poincaré disk.
+
+Tiles are grown breadth-first as batches of SU(1,1) Möbius matrices: every
+tile M of layer d spawns M·G_k (k = 0..p-1), where G_k is the half-turn
+about the midpoint of edge k of the central p-gon. Duplicate tiles and
+coincident vertices are merged with a uniform-grid spatial hash (3×3 cell
+neighbourhood), never by pairwise comparison.
+
+The result is a triangle mesh (fan from each tile centre, or the tiles
+themselves when p == 3) that can go straight through the ρ/K pipeline.
+
+Usage:
+    python -m adaptive_pi.hyperbolic_tiling --p 7 --q 3 --depth 8 --out outputs/tiling_7_3
+"""
+
+import argparse
+import math
+
+import numpy as np
+
+from .labels import compact_labels, component_labels
+from .mesh_io import face_areas, save_mesh_csv
+
+
+# ------- 1) Central polygon and generators -------
+def central_polygon(p: int, q: int):
+    """
+    Euclidean circumradius and edge-midpoint radius of the regular {p,q}
+    polygon centred at 0. Needs 1/p + 1/q < 1/2.
+    """
+    if 1.0 / p + 1.0 / q >= 0.5:
+        raise ValueError(f"{{{p},{q}}} is not hyperbolic (need 1/p + 1/q < 1/2)")
+    cosh_R = 1.0 / (math.tan(math.pi / p) * math.tan(math.pi / q))  # circumradius
+    cosh_r = math.cos(math.pi / q) / math.sin(math.pi / p)          # inradius
+    return math.tanh(math.acosh(cosh_R) / 2.0), math.tanh(math.acosh(cosh_r) / 2.0)
+
+
+def _translation(a: complex) -> np.ndarray:
+    """SU(1,1) matrix of z ↦ (z + a)/(1 + ā z)."""
+    s = 1.0 / math.sqrt(1.0 - abs(a) ** 2)
+    return s * np.array([[1.0, a], [np.conj(a), 1.0]], dtype=complex)
+
+
+def edge_generators(p: int, q: int) -> np.ndarray:
+    """(p, 2, 2) half-turns about the edge midpoints of the central polygon."""
+    _, r_mid = central_polygon(p, q)
+    half_turn = np.array([[1j, 0.0], [0.0, -1j]])
+    gens = []
+    for k in range(p):
+        m = r_mid * np.exp(1j * math.pi * (2 * k + 1) / p)
+        gens.append(_translation(m) @ half_turn @ _translation(-m))
+    return np.array(gens)
+
+
+def mobius(M: np.ndarray, z: np.ndarray) -> np.ndarray:
+    """Apply (n,2,2) matrices to (n,k) points: (a z + b)/(c z + d)."""
+    a, b = M[:, 0, 0, None], M[:, 0, 1, None]
+    c, d = M[:, 1, 0, None], M[:, 1, 1, None]
+    return (a * z + b) / (c * z + d)
+
+
+def _renormalize(M: np.ndarray) -> np.ndarray:
+    """Project back onto SU(1,1) form [[α, β], [β̄, ᾱ]] with |α|² − |β|² = 1."""
+    alpha = 0.5 * (M[:, 0, 0] + np.conj(M[:, 1, 1]))
+    beta = 0.5 * (M[:, 0, 1] + np.conj(M[:, 1, 0]))
+    s = 1.0 / np.sqrt(np.abs(alpha) ** 2 - np.abs(beta) ** 2)
+    alpha, beta = alpha * s, beta * s
+    out = np.empty_like(M)
+    out[:, 0, 0], out[:, 0, 1] = alpha, beta
+    out[:, 1, 0], out[:, 1, 1] = np.conj(beta), np.conj(alpha)
+    return out
+
+
+# ------- 2) Spatial-hash merge -------
+def merge_points(z: np.ndarray, tol: float) -> np.ndarray:
+    """
+    Cluster complex points closer than tol. Returns, for every point, the
+    smallest index in its cluster. Points are bucketed into tol-sized grid
+    cells; only the 3×3 neighbourhood of each cell is compared.
+    """
+    n = len(z)
+    if n == 0:
+        return np.zeros(0, dtype=np.intp)
+    kx = np.floor(z.real / tol).astype(np.int64)
+    ky = np.floor(z.imag / tol).astype(np.int64)
+    kx -= kx.min() - 1
+    ky -= ky.min() - 1
+    width = int(ky.max()) + 2
+    if (int(kx.max()) + 2) * width >= 2**62:
+        raise ValueError("tol too small for the point extent")
+    key = kx * width + ky
+
+    order = np.argsort(key, kind="stable")
+    skey = key[order]
+    ukey, start, count = np.unique(skey, return_index=True, return_counts=True)
+    max_count = int(count.max())
+
+    pairs_u, pairs_v = [], []
+    idx = np.arange(n)
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            nk = key + dx * width + dy
+            pos = np.minimum(np.searchsorted(ukey, nk), len(ukey) - 1)
+            hit = ukey[pos] == nk
+            i_pts, cell = idx[hit], pos[hit]
+            for j in range(max_count):
+                ok = j < count[cell]
+                if not ok.any():
+                    break
+                a = i_pts[ok]
+                b = order[start[cell[ok]] + j]
+                close = (np.abs(z[a] - z[b]) < tol) & (a < b)
+                pairs_u.append(a[close])
+                pairs_v.append(b[close])
+    return component_labels(n, np.concatenate(pairs_u), np.concatenate(pairs_v))
+
+
+# ------- 3) Tile growth -------
+def grow_tiles(p: int, q: int, depth: int, max_radius: float = 0.995,
+               max_tiles: int = 2_000_000) -> np.ndarray:
+    """
+    Breadth-first tile transforms up to `depth` layers (layer 0 is the
+    central tile). Tiles whose centre lies beyond Euclidean radius max_radius
+    are not kept. Returns an (n_tiles, 2, 2) complex array.
+    """
+    G = edge_generators(p, q)
+    r_vert, r_mid = central_polygon(p, q)
+    layers = [np.eye(2, dtype=complex)[None]]
+    prev = np.zeros((0, 2, 2), dtype=complex)
+    total = 1
+    for _ in range(depth):
+        cur = layers[-1]
+        if len(cur) == 0:
+            break
+        cand = np.einsum("nij,kjl->nkil", cur, G).reshape(-1, 2, 2)
+        cand = _renormalize(cand)
+        c_cand = cand[:, 0, 1] / cand[:, 1, 1]  # M(0)
+        keep = np.abs(c_cand) <= max_radius
+        cand, c_cand = cand[keep], c_cand[keep]
+        if len(cand) == 0:
+            break
+        # Neighbours of layer d live in layers d-1, d, d+1: compare against those only.
+        known = np.concatenate([prev, cur])
+        c_known = known[:, 0, 1] / known[:, 1, 1]
+        pts = np.concatenate([c_known, c_cand])
+        # Tile centres are ≥ 2·inradius apart; scale by the conformal factor.
+        tol = 0.25 * r_mid * float((1.0 - np.abs(pts) ** 2).min())
+        rep = merge_points(pts, tol)
+        own = rep[len(known):] == np.arange(len(known), len(pts))
+        new = cand[own]
+        total += len(new)
+        if total > max_tiles:
+            raise ValueError(f"more than {max_tiles} tiles; lower depth or max_radius")
+        prev = cur
+        layers.append(new)
+    return np.concatenate(layers)
+
+
+# ------- 4) Mesh assembly -------
+def tiling_mesh(p: int, q: int, depth: int, max_radius: float = 0.995,
+                max_tiles: int = 2_000_000):
+    """
+    Triangle mesh of the {p,q} tiling.
+    Returns (V (n,2) float, F (m,3) int, tile_of_face (m,) int).
+    """
+    M = grow_tiles(p, q, depth, max_radius, max_tiles)
+    r_vert, r_mid = central_polygon(p, q)
+    corners = r_vert * np.exp(2j * np.pi * np.arange(p) / p)
+    zc = mobius(M, corners[None, :].repeat(len(M), axis=0))  # (n_tiles, p)
+
+    pts = zc.ravel()
+    if p != 3:
+        pts = np.concatenate([pts, M[:, 0, 1] / M[:, 1, 1]])
+    # Vertices are ≥ one edge length apart; tol is a small fraction of the
+    # shortest Euclidean edge in the mesh.
+    tol = 1e-3 * float(np.abs(zc[:, 1] - zc[:, 0]).min())
+    ids, _ = compact_labels(merge_points(pts, tol))
+    first = np.full(ids.max() + 1, -1, dtype=np.intp)
+    first[ids[::-1]] = np.arange(len(ids))[::-1]
+    V = np.column_stack([pts[first].real, pts[first].imag])
+
+    n_tiles = len(M)
+    poly = ids[: n_tiles * p].reshape(n_tiles, p)
+    if p == 3:
+        return V, poly, np.arange(n_tiles)
+    centre = ids[n_tiles * p:]
+    F = np.stack([np.repeat(centre, p), poly.ravel(), np.roll(poly, -1, axis=1).ravel()], axis=1)
+    return V, F, np.repeat(np.arange(n_tiles), p)
+
+
+def hyperbolic_triangle_areas(V: np.ndarray, F: np.ndarray) -> np.ndarray:
+    """Hyperbolic (K = −1) areas π − (α+β+γ) of disk-model triangles."""
+    z = V[:, 0] + 1j * V[:, 1]
+    w = 1.0 - np.abs(z) ** 2
+
+    def dist(i, j):
+        return np.arccosh(1.0 + 2.0 * np.abs(z[i] - z[j]) ** 2 / (w[i] * w[j]))
+
+    a = dist(F[:, 1], F[:, 2])
+    b = dist(F[:, 2], F[:, 0])
+    c = dist(F[:, 0], F[:, 1])
+
+    def angle(opp, s1, s2):
+        cos_t = (np.cosh(s1) * np.cosh(s2) - np.cosh(opp)) / (np.sinh(s1) * np.sinh(s2))
+        return np.arccos(np.clip(cos_t, -1.0, 1.0))
+
+    return np.pi - angle(a, b, c) - angle(b, c, a) - angle(c, a, b)
+
+
+def euler_counts_mesh(F: np.ndarray):
+    """(V, E, F) from a triangle array (vertices counted as referenced ids)."""
+    e = np.sort(np.concatenate([F[:, [0, 1]], F[:, [1, 2]], F[:, [2, 0]]]), axis=1)
+    n_e = len(np.unique(e, axis=0))
+    return len(np.unique(F)), n_e, len(F)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Hyperbolic {p,q} tiling → triangle mesh CSVs")
+    ap.add_argument("--p", type=int, default=7, help="polygon sides")
+    ap.add_argument("--q", type=int, default=3, help="polygons per vertex")
+    ap.add_argument("--depth", type=int, default=6, help="BFS layers around the central tile")
+    ap.add_argument("--max-radius", type=float, default=0.995,
+                    help="drop tiles whose centre lies beyond this Euclidean disk radius")
+    ap.add_argument("--areas", choices=["hyperbolic", "euclidean"], default="hyperbolic",
+                    help="face areas written to _face_areas.csv")
+    ap.add_argument("--out", default="outputs/tiling", help="CSV prefix")
+    args = ap.parse_args()
+
+    V, F, tile = tiling_mesh(args.p, args.q, args.depth, args.max_radius)
+    if args.areas == "hyperbolic":
+        A = hyperbolic_triangle_areas(V, F)
+    else:
+        A = face_areas(np.column_stack([V, np.zeros(len(V))]), F)
+    save_mesh_csv(args.out, V, F, A)
+    nv, ne, nf = euler_counts_mesh(F)
+    print({"tiles": int(tile.max()) + 1, "V": nv, "E": ne, "F": nf, "chi": nv - ne + nf})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# Array-only connected-component labelling (vectorised union-find).
+
+import numpy as np
+
+
+def component_labels(n: int, u, v) -> np.ndarray:
+    """
+    Label the components of the graph on 0..n-1 with edges (u[i], v[i]).
+
+    Hook-and-shortcut: every round hooks the larger root of each edge onto
+    the smaller one (np.minimum.at) and then pointer-jumps until every node
+    points at its root. parent[x] <= x holds throughout, so the result is the
+    smallest node index of each component.
+    """
+    parent = np.arange(n)
+    u = np.asarray(u, dtype=np.intp).ravel()
+    v = np.asarray(v, dtype=np.intp).ravel()
+    while True:
+        pu, pv = parent[u], parent[v]
+        lo, hi = np.minimum(pu, pv), np.maximum(pu, pv)
+        mask = lo != hi
+        if not mask.any():
+            return parent
+        np.minimum.at(parent, hi[mask], lo[mask])
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+        # Only edges still spanning two roots matter in the next round.
+        u, v = u[mask], v[mask]
+
+
+def compact_labels(labels) -> tuple:
+    """Map arbitrary labels to 0..k-1 (ordered by first label value). Returns (ids, k)."""
+    uniq, ids = np.unique(labels, return_inverse=True)
+    return ids.ravel(), len(uniq)
@@ -0,0 +1,58 @@
+# CSV mesh I/O shared by the batch/tiling tools.
+# Layout matches the files shipped at the repo root:
+#   <prefix>_vertices.csv   x,y,z
+#   <prefix>_faces.csv      i,j,k
+#   <prefix>_face_areas.csv area      (optional; recomputed when missing)
+
+from pathlib import Path
+
+import numpy as np
+
+from .precision import cast_mesh
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+class Mesh:
+    """Plain V/F/A holder, same shape as KernelAdapter's mesh struct."""
+
+    def __init__(self, V, F, A):
+        self.V, self.F, self.A = V, F, A
+
+
+def face_areas(V: np.ndarray, F: np.ndarray) -> np.ndarray:
+    """Vectorised triangle areas 0.5·|(b-a)×(c-a)|."""
+    a, b, c = V[F[:, 0]], V[F[:, 1]], V[F[:, 2]]
+    return 0.5 * np.linalg.norm(np.cross(b - a, c - a), axis=1)
+
+
+def load_mesh_csv(prefix, root=REPO_ROOT, precision="double"):
+    """
+    Load <prefix>_vertices.csv / _faces.csv / _face_areas.csv from root.
+    Returns (V, F, A) in the dtypes of the precision policy
+    ("double": float64/int64, "compact": float32/int32).
+    """
+    root = Path(root)
+    V = np.loadtxt(root / f"{prefix}_vertices.csv", delimiter=",", skiprows=1, ndmin=2)
+    F = np.loadtxt(root / f"{prefix}_faces.csv", delimiter=",", skiprows=1, dtype=int, ndmin=2)
+    area_path = root / f"{prefix}_face_areas.csv"
+    if area_path.is_file():
+        A = np.loadtxt(area_path, delimiter=",", skiprows=1, ndmin=1)
+    else:
+        A = face_areas(V, F)
+    return cast_mesh(V, F, A, precision)
+
+
+def save_mesh_csv(prefix, V, F, A=None):
+    """Write the CSV layout above (z=0 is added for 2D vertex arrays)."""
+    prefix = str(prefix)
+    Path(prefix).parent.mkdir(parents=True, exist_ok=True)
+    V = np.asarray(V, float)
+    if V.shape[1] == 2:
+        V = np.column_stack([V, np.zeros(len(V))])
+    np.savetxt(f"{prefix}_vertices.csv", V, delimiter=",", header="x,y,z", comments="")
+    np.savetxt(f"{prefix}_faces.csv", np.asarray(F), delimiter=",", fmt="%d",
+               header="i,j,k", comments="")
+    if A is not None:
+        np.savetxt(f"{prefix}_face_areas.csv", np.asarray(A, float), delimiter=",",
+                   header="area", comments="")
@@ -0,0 +1,57 @@
+# Precision policy for mesh arrays and per-face fields.
+#
+#   "double"  : V, A, K, ρ float64; F int64   (historical behaviour)
+#   "compact" : V, A, K, ρ float32; F int32   (half the memory/bandwidth)
+#
+# Reductions that feed Gauss–Bonnet are always accumulated in float64.
+
+import numpy as np
+
+PRECISIONS = {
+    "double": (np.float64, np.int64),
+    "compact": (np.float32, np.int32),
+}
+
+
+def dtypes(precision: str = "double"):
+    """(float dtype, index dtype) for a policy name."""
+    try:
+        return PRECISIONS[precision]
+    except KeyError:
+        raise ValueError(f"precision must be one of {sorted(PRECISIONS)}, got {precision!r}")
+
+
+def cast_mesh(V, F, A, precision: str = "double"):
+    """Return V, F, A converted to the policy's dtypes (no copy when already matching)."""
+    fdt, idt = dtypes(precision)
+    F = np.asarray(F)
+    if F.size and int(F.max()) > np.iinfo(idt).max:
+        raise ValueError(f"face indices exceed {np.dtype(idt).name} for precision {precision!r}")
+    return np.asarray(V, fdt), np.asarray(F, idt), np.asarray(A, fdt)
+
+
+def gb_sum(K_face, A) -> float:
+    """Σ K_f A_f with float64 products and accumulation, whatever the input dtype."""
+    return float(np.multiply(K_face, A, dtype=np.float64).sum())
+
+
+def drift_report(ref: dict, test: dict) -> dict:
+    """
+    Per-field drift of `test` against a float64 reference run.
+    ref/test map field name → array; returns {name: {max_abs, max_rel, rms}}.
+    """
+    report = {}
+    for name, r in ref.items():
+        r = np.asarray(r, np.float64)
+        d = np.asarray(test[name], np.float64) - r
+        scale = np.maximum(np.abs(r), np.finfo(np.float64).tiny)
+        report[name] = {
+            "max_abs": float(np.abs(d).max()),
+            "max_rel": float((np.abs(d) / scale).max()),
+            "rms": float(np.sqrt(np.mean(d * d))),
+        }
+    return report
+
+
+def nbytes(*arrays) -> int:
+    return int(sum(np.asarray(a).nbytes for a in arrays))
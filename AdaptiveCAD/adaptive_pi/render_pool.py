@@ -0,0 +1,109 @@
+# Background PNG rendering so the next solve overlaps the previous savefig.
+#
+# pyplot is not thread-safe, so jobs run in worker processes. submit() blocks
+# once max_pending jobs are in flight (backpressure); wait() blocks until all
+# submitted jobs finish and re-raises the first render error to the caller.
+
+import os
+import threading
+from concurrent.futures import FIRST_EXCEPTION, Future, ProcessPoolExecutor, wait as wait_futures
+from typing import Optional
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+
+def render_face_png(V, F, values, outfile, title="", cbar_label="K (curvature)"):
+    """Flat per-face heatmap of `values` on the (x, y) projection, saved as PNG."""
+    fig, ax = plt.subplots(figsize=(7,5))
+    t = ax.tripcolor(V[:,0], V[:,1], F, facecolors=values, shading='flat')
+    ax.triplot(V[:,0], V[:,1], F, linewidth=0.2)
+    ax.set_aspect('equal'); ax.axis('off')
+    cbar = plt.colorbar(t, ax=ax)
+    cbar.set_label(cbar_label)
+    ax.set_title(title)
+    fig.tight_layout()
+    os.makedirs(os.path.dirname(outfile) or ".", exist_ok=True)
+    fig.savefig(outfile, dpi=220, bbox_inches="tight")
+    plt.close(fig)
+    return outfile
+
+
+class RenderPool:
+    """
+    Bounded pool of render worker processes.
+
+    workers=0 renders inline in submit() (no overlap, same API), which keeps
+    single-shot scripts and debugging simple.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: Optional[int] = None):
+        self.workers = int(workers)
+        self._executor = ProcessPoolExecutor(self.workers) if self.workers > 0 else None
+        self._slots = threading.BoundedSemaphore(max_pending or max(2 * self.workers, 1))
+        self._lock = threading.Lock()
+        self._submitted = []  # reaped by wait()
+
+    def submit(self, V, F, values, outfile, title="", cbar_label="K (curvature)") -> Future:
+        """Queue one PNG; blocks while max_pending renders are outstanding."""
+        if self._executor is None:
+            fut = Future()
+            try:
+                fut.set_result(render_face_png(V, F, values, outfile, title, cbar_label))
+            except Exception as exc:
+                fut.set_exception(exc)
+        else:
+            self._slots.acquire()
+            try:
+                fut = self._executor.submit(
+                    render_face_png, np.asarray(V), np.asarray(F), np.asarray(values),
+                    outfile, title, cbar_label,
+                )
+            except BaseException:
+                self._slots.release()
+                raise
+            fut.add_done_callback(lambda _f: self._slots.release())
+        with self._lock:
+            self._submitted.append(fut)
+        return fut
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(not f.done() for f in self._submitted)
+
+    def wait(self, timeout: Optional[float] = None):
+        """
+        Block until every submitted render has finished (or one failed).
+        Re-raises the first render exception in submission order; finished
+        jobs are forgotten, so each error is raised at most once.
+        """
+        with self._lock:
+            futures = list(self._submitted)
+        not_done = set()
+        if futures:
+            _, not_done = wait_futures(futures, timeout=timeout, return_when=FIRST_EXCEPTION)
+        with self._lock:
+            self._submitted = [f for f in self._submitted if not f.done()]
+        for fut in futures:
+            if fut.done() and not fut.cancelled() and fut.exception() is not None:
+                raise fut.exception()
+        if not_done:
+            raise TimeoutError(f"{len(not_done)} renders still pending")
+
+    def close(self, cancel_pending: bool = False):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=cancel_pending)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.wait()
+        finally:
+            self.close(cancel_pending=exc_type is not None)
+        return False
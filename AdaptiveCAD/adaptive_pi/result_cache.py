@@ -0,0 +1,147 @@
+# Content-addressed on-disk cache for K_face / ρ results (and optional PNGs).
+#
+# An entry is keyed by a SHA-256 over the mesh arrays, the run parameters and
+# the source of the pipeline modules, so editing the code invalidates old
+# results automatically. Entries are evicted least-recently-used first once
+# the cache grows past its byte budget.
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+# Modules whose source participates in the code-version hash: every module
+# the cached pipelines compute K/ρ or draw PNGs with. Add new ones here when
+# pipeline code moves into another module.
+CODE_FILES = (
+    "adaptivecad_render.py",
+    "driver_adaptivecad.py",
+    "solve_curvature.py",
+    "rho_series.py",     # adaptive ρ mode
+    "precision.py",      # dtype casting, float64 Gauss–Bonnet sums
+    "render_pool.py",    # driver PNG renderer
+)
+
+_code_version = None
+
+
+def code_version() -> str:
+    """SHA-256 over the pipeline sources (computed once per process)."""
+    global _code_version
+    if _code_version is None:
+        h = hashlib.sha256()
+        here = Path(__file__).resolve().parent
+        for name in CODE_FILES:
+            h.update(name.encode())
+            h.update((here / name).read_bytes())
+        _code_version = h.hexdigest()
+    return _code_version
+
+
+def cache_key(arrays: Dict[str, np.ndarray], params: dict) -> str:
+    """
+    Hash mesh arrays (dtype, shape and raw bytes) plus JSON-serialisable
+    params and the code version into a hex key.
+    """
+    h = hashlib.sha256()
+    for name in sorted(arrays):
+        a = np.ascontiguousarray(arrays[name])
+        h.update(name.encode())
+        h.update(str(a.dtype).encode())
+        h.update(str(a.shape).encode())
+        h.update(a.tobytes())
+    h.update(json.dumps(params, sort_keys=True, default=repr).encode())
+    h.update(code_version().encode())
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    Directory layout: <root>/<key>/{fields.npz, stats.json, *.png}.
+    The mtime of stats.json records the last access and drives LRU eviction.
+    """
+
+    def __init__(self, root, max_bytes: int = 256 * 2**20):
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return {"fields", "stats", "pngs"} for a hit, else None."""
+        entry = self.root / key
+        stats_path = entry / "stats.json"
+        if not stats_path.is_file():
+            return None
+        try:
+            with np.load(entry / "fields.npz") as z:
+                fields = {k: z[k] for k in z.files}
+            with open(stats_path) as f:
+                stats = json.load(f)
+        except (OSError, ValueError):
+            # Half-written or corrupted entry: treat as a miss and drop it.
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        os.utime(stats_path)
+        pngs = {p.stem: p for p in entry.glob("*.png")}
+        return {"fields": fields, "stats": stats, "pngs": pngs}
+
+    def put(self, key: str, fields: Dict[str, np.ndarray], stats: dict,
+            pngs: Optional[Dict[str, str]] = None) -> Path:
+        """
+        Store an entry atomically (written to a temp dir, then renamed).
+        pngs maps an entry-local name to a PNG already written on disk.
+        """
+        entry = self.root / key
+        tmp = Path(tempfile.mkdtemp(prefix=".tmp-", dir=self.root))
+        try:
+            np.savez(tmp / "fields.npz", **fields)
+            for name, src in (pngs or {}).items():
+                shutil.copyfile(src, tmp / f"{name}.png")
+            with open(tmp / "stats.json", "w") as f:
+                json.dump(stats, f, indent=2)
+            if entry.exists():
+                shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp, entry)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self.evict()
+        return entry
+
+    def evict(self) -> int:
+        """Drop least-recently-used entries until under max_bytes. Returns count removed."""
+        entries = []
+        total = 0
+        for entry in self.root.iterdir():
+            stats_path = entry / "stats.json"
+            if not entry.is_dir() or not stats_path.is_file():
+                continue
+            size = sum(p.stat().st_size for p in entry.iterdir() if p.is_file())
+            entries.append((stats_path.stat().st_mtime, size, entry))
+            total += size
+        removed = 0
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.root.rglob("*") if p.is_file())
+
+
+def restore_pngs(hit: dict, targets: Dict[str, str]) -> bool:
+    """Copy cached PNGs to their output paths; False if any is missing."""
+    if not all(name in hit["pngs"] for name in targets):
+        return False
+    for name, dst in targets.items():
+        os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+        shutil.copyfile(hit["pngs"][name], dst)
+    return True
@@ -0,0 +1,141 @@
+"""
+Per-face sensitivities of K_face and ρ for the adaptivecad_render pipeline,
+obtained in one vectorised pass (closed form, no finite-difference reruns).
+
+Pipeline (see adaptivecad_render.compute_rho_field):
+    r_model = R_MODEL · r_mesh / max r_mesh
+    K_raw   = K0 + BETA · r_model²
+    s       = 2πχ / Σ K_raw A           (Gauss–Bonnet scale)
+    K       = s · K_raw
+    ρ       = 1 + C·K                    (tempered)
+            = h(K R_V²) / h(K R_F²)      (exact; h(x) = sinh√−x/√−x, sin√x/√x)
+
+Chain rule: dK = s·dK_raw + ds·K_raw with ds = −s·Σ(dK_raw A)/Σ(K_raw A).
+
+Usage:
+    python -m adaptive_pi.sensitivity --mode exact --outdir outputs/sensitivity
+"""
+
+import argparse
+import json
+import math
+import os
+
+import numpy as np
+
+from . import adaptivecad_render as acr
+from .precision import gb_sum
+from .render_pool import RenderPool
+
+PARAMS = ("R_V", "R_F", "C_CONST", "R_MODEL", "K0", "BETA")
+
+
+def h_and_dh(x):
+    """
+    h(x) = S_K(r)/r as a function of x = K r², and dh/dx, vectorised.
+    A short Taylor series is used near x = 0, where the closed forms cancel.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    small = np.abs(x) < 1e-3
+    u = np.sqrt(np.abs(np.where(small, 1.0, x)))
+    neg = x < 0
+    h = np.where(neg, np.sinh(u) / u, np.sin(u) / u)
+    du = np.where(neg, u * np.cosh(u) - np.sinh(u), u * np.cos(u) - np.sin(u))
+    dh = np.where(neg, -du, du) / (2.0 * u ** 3)
+    h_series = 1.0 - x / 6.0 + x * x / 120.0 - x ** 3 / 5040.0
+    dh_series = -1.0 / 6.0 + x / 60.0 - x * x / 1680.0 + x ** 3 / 90720.0
+    return np.where(small, h_series, h), np.where(small, dh_series, dh)
+
+
+def sensitivity_maps(V, F, A, mode=acr.MODE, rv=acr.R_V, rf=acr.R_F, c=acr.C_CONST,
+                     r_model_max=acr.R_MODEL, k0=acr.K0, beta=acr.BETA, target_chi=-4):
+    """
+    Returns {"K_face", "rho", "GB_scale", "dK": {p: (nf,)}, "drho": {p: (nf,)},
+    "dGB_scale": {p: float}} for p in PARAMS.
+    In tempered mode with c=None, c = (R_F² − R_V²)/6 and the radii enter through it.
+    """
+    bary = V[F].mean(axis=1)
+    r_mesh = np.linalg.norm(bary, axis=1)
+    r_model = (r_model_max / r_mesh.max()) * r_mesh
+    K_raw = k0 + beta * r_model ** 2
+
+    target = 2.0 * math.pi * float(target_chi)
+    S = gb_sum(K_raw, A)
+    s = target / S
+    K = s * K_raw
+
+    zero = np.zeros_like(K_raw)
+    dK_raw = {
+        "R_V": zero, "R_F": zero, "C_CONST": zero,
+        "R_MODEL": 2.0 * beta * r_model ** 2 / r_model_max,
+        "K0": np.ones_like(K_raw),
+        "BETA": r_model ** 2,
+    }
+    dK, ds = {}, {}
+    for p, d in dK_raw.items():
+        ds[p] = -s * gb_sum(d, A) / S
+        dK[p] = s * d + ds[p] * K_raw
+
+    drho = {}
+    if mode == "tempered":
+        c_eff = (rf * rf - rv * rv) / 6.0 if c is None else c
+        rho = 1.0 + c_eff * K
+        dc = {p: 0.0 for p in PARAMS}
+        if c is None:
+            dc["R_V"], dc["R_F"] = -rv / 3.0, rf / 3.0
+        else:
+            dc["C_CONST"] = 1.0
+        for p in PARAMS:
+            drho[p] = c_eff * dK[p] + dc[p] * K
+    else:
+        hv, dhv = h_and_dh(K * rv * rv)
+        hf, dhf = h_and_dh(K * rf * rf)
+        rho = hv / hf
+        drho_dK = (dhv * rv * rv - rho * dhf * rf * rf) / hf
+        for p in PARAMS:
+            drho[p] = drho_dK * dK[p]
+        drho["R_V"] = drho["R_V"] + dhv * 2.0 * K * rv / hf
+        drho["R_F"] = drho["R_F"] - rho * dhf * 2.0 * K * rf / hf
+
+    return {"K_face": K, "rho": rho, "GB_scale": s, "dK": dK, "drho": drho, "dGB_scale": ds}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Per-face dK/dθ and dρ/dθ maps in one pass")
+    ap.add_argument("--mode", choices=["tempered", "exact", "adaptive"], default=acr.MODE,
+                    help="adaptive uses the exact-mode derivatives (ρ agrees to RHO_TOL)")
+    ap.add_argument("--outdir", default="outputs/sensitivity")
+    ap.add_argument("--render-workers", type=int, default=2)
+    ap.add_argument("--no-png", action="store_true", help="only write the CSV/JSON")
+    args = ap.parse_args()
+
+    V, F, A = acr.load_mesh_from_adaptivecad()
+    out = sensitivity_maps(V, F, A, mode=args.mode)
+    os.makedirs(args.outdir, exist_ok=True)
+
+    cols = {"K_face": out["K_face"], "rho": out["rho"]}
+    for p in PARAMS:
+        cols[f"dK_d{p}"] = out["dK"][p]
+        cols[f"drho_d{p}"] = out["drho"][p]
+    np.savetxt(os.path.join(args.outdir, "sensitivity_maps.csv"), np.column_stack(list(cols.values())),
+               delimiter=",", header=",".join(cols), comments="")
+    with open(os.path.join(args.outdir, "sensitivity_stats.json"), "w") as f:
+        json.dump({"mode": args.mode, "GB_scale": out["GB_scale"], "dGB_scale": out["dGB_scale"],
+                   "max_abs_drho": {p: float(np.abs(out["drho"][p]).max()) for p in PARAMS}},
+                  f, indent=2)
+
+    if not args.no_png:
+        with RenderPool(args.render_workers) as pool:
+            for p in PARAMS:
+                for field in ("K", "rho"):
+                    values = out["dK" if field == "K" else "drho"][p]
+                    if not np.any(values):
+                        continue
+                    label = f"∂{'K' if field == 'K' else 'ρ'}/∂{p}"
+                    pool.submit(V, F, values, os.path.join(args.outdir, f"d{field}_d{p}.png"),
+                                title=f"{label} ({args.mode})", cbar_label=label)
+    print("Wrote:", args.outdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,453 @@
+"""
+Local HTTP/JSON query service for closure tables and per-face ρ fields.
+
+One long-lived process keeps meshes (and their barycenter radii) in memory,
+so dashboard queries skip interpreter start-up and CSV loading. Requests to
+the same endpoint that arrive within a short window are coalesced into one
+vectorised evaluation. PNG rendering goes to a RenderPool, so the event loop
+never waits on matplotlib. Stdlib asyncio only; no web framework needed.
+
+Endpoints (GET with query parameters, or POST with a JSON body):
+    GET  /health
+    GET  /metrics                  latency percentiles and batch sizes per endpoint
+    ANY  /feasible   n, q, rho     scalars or equal-length lists → feasible, ρ*, δ/(2π_f)
+    ANY  /table      rho[, nmax, qmax]     admissible {n,q} rows, as generate_tables.py
+    ANY  /rho_field  mesh[, mode, r_v, r_f, c, r_model, k0, beta, target_chi, rho_tol,
+                     fields, render]    stats of compute_rho_field (+ arrays / PNG);
+                                        render=1 writes outputs/service_<mesh>_rho.png
+
+Usage:
+    python -m adaptive_pi.service --port 8765 --preload user_params c_neg0623
+    curl 'localhost:8765/feasible?n=7&q=3&rho=1.2'
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import re
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from . import adaptivecad_render as acr
+from .mesh_io import REPO_ROOT, load_mesh_csv
+from .render_pool import RenderPool
+from .rho_series import rho_field
+
+if str(REPO_ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT / "src"))
+from closure import delta_normalized, feasible, rho_star  # noqa: E402
+
+FIELD_DEFAULTS = {
+    "mode": acr.MODE, "r_v": acr.R_V, "r_f": acr.R_F, "c": acr.C_CONST,
+    "r_model": acr.R_MODEL, "k0": acr.K0, "beta": acr.BETA, "target_chi": -4,
+    "rho_tol": acr.RHO_TOL,
+}
+MESH_NAME = re.compile(r"^[A-Za-z0-9_]+$")
+MESH_FILES = ("_vertices.csv", "_faces.csv", "_face_areas.csv")
+RENDER_DIR = Path("outputs")
+
+
+class BadRequest(ValueError):
+    pass
+
+
+class NotFound(LookupError):
+    """Unknown endpoint (404); any other handler error is a 400/500."""
+
+
+def _field_params(r):
+    """FIELD_DEFAULTS overlaid with the request's values, numbers parsed (c may be None)."""
+    p = dict(FIELD_DEFAULTS)
+    p.update({k: v for k, v in r.items() if k in FIELD_DEFAULTS})
+    for k, v in p.items():
+        if k == "mode":
+            continue
+        if k == "c" and v in (None, "", "none", "None", "null"):
+            p[k] = None  # derive c from r_v, r_f
+            continue
+        try:
+            p[k] = float(v)
+        except (TypeError, ValueError):
+            raise BadRequest(f"{k} must be a number, got {v!r}") from None
+        if not math.isfinite(p[k]):
+            raise BadRequest(f"{k} must be finite, got {v!r}")
+    return p
+
+
+# ------- 1) Warm state -------
+class WarmMesh:
+    """Mesh arrays plus the barycenter radii every ρ query starts from."""
+
+    def __init__(self, V, F, A):
+        self.V, self.F = V, F
+        self.A = np.asarray(A, dtype=np.float64)
+        self.r_mesh = np.linalg.norm(V[F].mean(axis=1), axis=1)
+        self.r_max = float(self.r_mesh.max())
+
+
+class MeshStore:
+    """
+    Meshes by CSV prefix (repo root), loaded on first use and kept. Only
+    plain names ([A-Za-z0-9_]+) whose three CSV files exist under root are
+    accepted, so a client cannot reach files elsewhere.
+    """
+
+    def __init__(self, root=REPO_ROOT):
+        self.root = Path(root)
+        self._meshes = {}
+        self._lock = threading.Lock()  # loads run on executor threads
+
+    def get(self, name: str) -> WarmMesh:
+        with self._lock:
+            if name not in self._meshes:
+                if not MESH_NAME.match(name):
+                    raise BadRequest(f"mesh must be a plain CSV prefix such as user_params, got {name!r}")
+                missing = [name + s for s in MESH_FILES if not (self.root / (name + s)).is_file()]
+                if missing:
+                    raise BadRequest(f"unknown mesh {name!r}: missing {', '.join(missing)}")
+                try:
+                    self._meshes[name] = WarmMesh(*load_mesh_csv(name, self.root))
+                except (OSError, ValueError) as exc:
+                    raise BadRequest(f"cannot load mesh {name!r}: {exc}") from None
+            return self._meshes[name]
+
+    def names(self):
+        return sorted(self._meshes)
+
+
+_grid_cache = {}
+
+
+def nq_grid(nmax: int, qmax: int):
+    """(n, q, ρ*) grids for 3..nmax × 3..qmax, cached per size."""
+    if (nmax, qmax) not in _grid_cache:
+        n, q = np.meshgrid(np.arange(3, nmax + 1), np.arange(3, qmax + 1), indexing="ij")
+        _grid_cache[nmax, qmax] = (n, q, rho_star(n, q))
+    return _grid_cache[nmax, qmax]
+
+
+# ------- 2) Batched evaluators (list of requests → list of responses) -------
+def eval_feasible(reqs):
+    parts = []
+    for r in reqs:
+        try:
+            n, q, rho = np.broadcast_arrays(*(np.atleast_1d(np.asarray(r[k], dtype=np.float64))
+                                              for k in ("n", "q", "rho")))
+        except (KeyError, ValueError) as exc:
+            raise BadRequest(f"feasible needs n, q, rho of matching length ({exc})") from None
+        parts.append((n, q, rho))
+    sizes = [len(p[0]) for p in parts]
+    n, q, rho = (np.concatenate([p[i] for p in parts]) for i in range(3))
+    ok, rs, dn = feasible(n, q, rho), rho_star(n, q), delta_normalized(n, q, rho)
+    out, at = [], 0
+    for m in sizes:
+        sl = slice(at, at + m)
+        out.append({"feasible": ok[sl].tolist(), "rho_star": rs[sl].tolist(),
+                    "delta": dn[sl].tolist()})
+        at += m
+    return out
+
+
+def eval_table(reqs):
+    groups = defaultdict(list)
+    for i, r in enumerate(reqs):
+        try:
+            key = (int(r.get("nmax", 20)), int(r.get("qmax", 20)))
+            groups[key].append((i, float(r["rho"])))
+        except (KeyError, ValueError, TypeError):
+            raise BadRequest("table needs rho (and optional integer nmax, qmax)") from None
+    out = [None] * len(reqs)
+    for (nmax, qmax), items in groups.items():
+        n, q, rs = nq_grid(nmax, qmax)
+        rho = np.array([x for _, x in items])[:, None, None]
+        ok = feasible(n, q, rho)                      # (m, N, Q) in one pass
+        for (i, x), mask in zip(items, ok):
+            out[i] = {"rho": x, "rows": [
+                {"n": int(a), "q": int(b), "rho_star": float(c), "delta": float(x - c)}
+                for a, b, c in zip(n[mask], q[mask], rs[mask])
+            ]}
+    return out
+
+
+def eval_rho_field(reqs, store: MeshStore):
+    """
+    Same maths as adaptivecad_render.compute_rho_field. K for all requests on
+    one mesh is built as one (m, n_faces) array; ρ is evaluated per
+    (mode, r_v, r_f, c, rho_tol) group.
+    """
+    jobs = []
+    for r in reqs:
+        p = _field_params(r)
+        if p["mode"] not in ("tempered", "exact", "adaptive"):
+            raise BadRequest(f"unknown mode {p['mode']!r}")
+        if "mesh" not in r:
+            raise BadRequest("rho_field needs mesh (a CSV prefix such as user_params)")
+        jobs.append((store.get(str(r["mesh"])), p))
+
+    out = [None] * len(reqs)
+    by_mesh = defaultdict(list)
+    for i, (mesh, p) in enumerate(jobs):
+        by_mesh[id(mesh)].append(i)
+    for idx in by_mesh.values():
+        mesh = jobs[idx[0]][0]
+        P = {k: np.array([jobs[i][1][k] for i in idx])[:, None]
+             for k in ("r_model", "k0", "beta", "target_chi")}
+        r_model = (P["r_model"] / mesh.r_max) * mesh.r_mesh[None, :]
+        K_raw = P["k0"] + P["beta"] * r_model ** 2
+        target = 2.0 * math.pi * P["target_chi"][:, 0]
+        current = K_raw @ mesh.A
+        # Same guard as gauss_bonnet_normalize: a zero total is left unscaled.
+        flat = np.abs(current) < 1e-14
+        s = target / np.where(flat, 1.0, current)
+        s[flat] = 1.0
+        K = s[:, None] * K_raw
+
+        groups = defaultdict(list)
+        for row, i in enumerate(idx):
+            p = jobs[i][1]
+            groups[(p["mode"], p["r_v"], p["r_f"], p["c"], p["rho_tol"])].append(row)
+        for (mode, rv, rf, c, tol), rows in groups.items():
+            rho, info = rho_field(K[rows], mode, rv, rf, c, tol)
+            for k, row in enumerate(rows):
+                i = idx[row]
+                res = {
+                    "mesh": str(reqs[i]["mesh"]), "n_faces": int(K.shape[1]),
+                    **jobs[i][1],
+                    "GB_scale": float(s[row]), "GB_sum_KA": float(K[row] @ mesh.A),
+                    "GB_target": float(target[row]),
+                    "K_min": float(K[row].min()), "K_max": float(K[row].max()),
+                    "K_mean": float(K[row].mean()),
+                    "rho_min": float(rho[k].min()), "rho_max": float(rho[k].max()),
+                    "rho_mean": float(rho[k].mean()),
+                    "_K": K[row], "_rho": rho[k], "_mesh": mesh,
+                }
+                if info is not None:
+                    res["rho_adaptive_batch"] = info  # split over every request in the group
+                out[i] = res
+    return out
+
+
+class Batcher:
+    """
+    Coalesces calls that arrive within `window` seconds (or until max_batch)
+    into one evaluator call. The evaluator (and any first CSV load in it)
+    runs on the loop's default executor, so the loop keeps accepting and
+    batching other clients meanwhile.
+    """
+
+    def __init__(self, evaluate, window=0.002, max_batch=256):
+        self.evaluate = evaluate
+        self.window, self.max_batch = window, max_batch
+        self._queue = []
+        self._timer = None
+        self.batch_sizes = deque(maxlen=1000)
+
+    async def __call__(self, req):
+        fut = asyncio.get_running_loop().create_future()
+        self._queue.append((req, fut))
+        if len(self._queue) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await fut
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._queue = self._queue, []
+        if not batch:
+            return
+        self.batch_sizes.append(len(batch))
+        asyncio.get_running_loop().run_in_executor(None, self._run, batch)
+
+    def _run(self, batch):
+        """Executor side: evaluate, then hand each result back to the loop."""
+        try:
+            results = [(res, None) for res in self.evaluate([r for r, _ in batch])]
+        except Exception:
+            # Re-run one by one so a failing request only fails itself.
+            results = []
+            for r, _ in batch:
+                try:
+                    results.append((self.evaluate([r])[0], None))
+                except Exception as exc:
+                    results.append((None, exc))
+        for (_, fut), (res, exc) in zip(batch, results):
+            fut.get_loop().call_soon_threadsafe(_settle, fut, res, exc)
+
+
+def _settle(fut, res, exc):
+    if fut.cancelled():
+        return
+    if exc is not None:
+        fut.set_exception(exc)
+    else:
+        fut.set_result(res)
+
+
+# ------- 3) Service -------
+class QueryService:
+    def __init__(self, store=None, render_workers=2, window=0.002, latency_samples=2000):
+        self.store = store or MeshStore()
+        self.pool = RenderPool(render_workers)
+        self.batchers = {
+            "/feasible": Batcher(eval_feasible, window),
+            "/table": Batcher(eval_table, window),
+            "/rho_field": Batcher(lambda reqs: eval_rho_field(reqs, self.store), window),
+        }
+        self.latency = defaultdict(lambda: deque(maxlen=latency_samples))
+        self.counts = defaultdict(int)
+        self.errors = defaultdict(int)
+        self.started = time.time()
+
+    async def handle(self, path, req):
+        if path == "/health":
+            return {"ok": True, "meshes": self.store.names()}
+        if path == "/metrics":
+            return self.metrics()
+        if path not in self.batchers:
+            raise NotFound(path)
+        res = await self.batchers[path](req)
+        if path != "/rho_field":
+            return res
+        res = dict(res)
+        K, rho, mesh = res.pop("_K"), res.pop("_rho"), res.pop("_mesh")
+        if _flag(req.get("fields")):
+            res["K_face"], res["rho"] = K.tolist(), rho.tolist()
+        if _flag(req.get("render")):
+            outfile = _render_path(res["mesh"])
+            loop = asyncio.get_running_loop()
+            # submit() may block on backpressure, so it runs off the event loop.
+            fut = await loop.run_in_executor(
+                None, lambda: self.pool.submit(mesh.V, mesh.F, rho, outfile,
+                                               title=f"ρ ({res['mode']})", cbar_label="ρ"))
+            res["png"] = await asyncio.wrap_future(fut)
+        return res
+
+    def metrics(self):
+        out = {"uptime_s": time.time() - self.started, "endpoints": {}}
+        for path, lat in self.latency.items():
+            a = np.array(lat) * 1e3
+            ep = {"requests": self.counts[path], "errors": self.errors[path]}
+            if len(a):
+                ep.update({"p50_ms": float(np.percentile(a, 50)), "p95_ms": float(np.percentile(a, 95)),
+                           "p99_ms": float(np.percentile(a, 99)), "max_ms": float(a.max()),
+                           "mean_ms": float(a.mean())})
+            b = self.batchers.get(path)
+            if b is not None and b.batch_sizes:
+                ep["batches"] = len(b.batch_sizes)
+                ep["mean_batch"] = float(np.mean(b.batch_sizes))
+            out["endpoints"][path] = ep
+        return out
+
+    # ------- HTTP/1.1 (keep-alive, Content-Length bodies only) -------
+    async def serve_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    method, target, _ = line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = h.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+
+                t0 = time.perf_counter()
+                url = urlsplit(target)
+                status, payload = 200, None
+                try:
+                    req = {k: v[0] if len(v) == 1 else v
+                           for k, v in parse_qs(url.query).items()}
+                    if body:
+                        req.update(json.loads(body))
+                    payload = await self.handle(url.path, req)
+                except NotFound:
+                    status, payload = 404, {"error": f"no endpoint {url.path}"}
+                except (BadRequest, json.JSONDecodeError) as exc:
+                    status, payload = 400, {"error": str(exc)}
+                except Exception as exc:
+                    status, payload = 500, {"error": f"{type(exc).__name__}: {exc}"}
+                self.latency[url.path].append(time.perf_counter() - t0)
+                self.counts[url.path] += 1
+                if status != 200:
+                    self.errors[url.path] += 1
+
+                data = json.dumps(payload).encode()
+                close = headers.get("connection", "").lower() == "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def close(self):
+        self.pool.close()
+
+
+def _flag(v):
+    return v in (True, 1, "1", "true", "yes")
+
+
+def _render_path(mesh):
+    """outputs/service_<mesh>_rho.png, refused if it would resolve outside outputs/."""
+    path = RENDER_DIR / f"service_{mesh}_rho.png"
+    if path.resolve().parent != RENDER_DIR.resolve():
+        raise BadRequest(f"render path for mesh {mesh!r} leaves {RENDER_DIR}/")
+    return str(path)
+
+
+async def serve(host, port, service):
+    server = await asyncio.start_server(service.serve_client, host, port)
+    print(f"Serving on http://{host}:{port}  (meshes: {', '.join(service.store.names()) or 'lazy'})")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Warm local HTTP/JSON service for closure and ρ queries")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--preload", nargs="*", default=["user_params"],
+                    help="mesh CSV prefixes to load at start-up")
+    ap.add_argument("--render-workers", type=int, default=2)
+    ap.add_argument("--batch-window-ms", type=float, default=2.0,
+                    help="coalesce requests arriving within this window")
+    args = ap.parse_args()
+
+    service = QueryService(render_workers=args.render_workers, window=args.batch_window_ms / 1e3)
+    for name in args.preload:
+        service.store.get(name)
+    nq_grid(20, 20)
+    try:
+        asyncio.run(serve(args.host, args.port, service))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,568 @@
+"""
+Spatial index over mesh triangles for point probes and field transfer.
+
+Queries work in the mesh's own dimension. The shipped genus-3 meshes are 3D
+surfaces whose (x, y) projections overlap, so they are indexed in 3D; a mesh
+whose z is constant (tilings, embeddings) is indexed in the plane:
+
+    FaceGrid.nearest(P)    nearest triangle per point (exact point-triangle distance)
+    FaceGrid.locate(P)     face containing each point (−1 if none)
+    FaceGrid.within(P, r)  faces within distance r of each point
+    FaceGrid.probe(P, f)   per-face field sampled at points
+
+nearest walks a balanced bounding-volume tree: faces are split at the median
+barycenter along the widest axis, level by level, and each node keeps the box
+of its triangles. A batch of queries descends greedily to one leaf for an
+initial bound, then visits only the nodes whose box is closer than it,
+lowering the bound on the way. Faces in the leaves reached are screened
+against their own oriented box before the exact distance test, which keeps
+long sliver triangles cheap. On planar meshes locate uses a uniform grid
+(CSR layout) and a barycentric test, and nearest only searches the faces at
+the mesh's open edges for points no face contains; a planar mesh whose
+triangles fold over or overlap each other is rejected.
+
+transfer_field carries a per-face field (K, ρ, …) from one mesh to another.
+Every destination face is split into m² equal-area sub-triangles, each
+centroid is mapped to the source face it lies on (or the nearest one), and
+the samples are averaged per face with np.bincount. The Σ K·A mismatch of
+that average against the source is reported and, with conserve, then removed
+by a rescale.
+
+Usage:
+    python -m adaptive_pi.spatial_index transfer user_params user_params_K_face.csv:K_face \\
+        other_mesh --out outputs/other_mesh_K_face.csv
+    python -m adaptive_pi.spatial_index probe c_neg0623 c_neg0623_rho.csv:rho points.csv
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .mesh_io import REPO_ROOT, load_mesh_csv
+from .precision import gb_sum
+
+BLOCK = 1 << 16    # query points per vectorised chunk (bounds pair-array memory)
+LEAF_SIZE = 8      # faces per tree leaf
+PLANAR_TOL = 1e-9  # z extent (relative to the x/y extent) below which a mesh is planar
+
+
+class _Grid:
+    """CSR map from grid cells to the boxes [lo, hi] (n, 2) that overlap them."""
+
+    def __init__(self, lo, hi, cell):
+        self.cell = float(cell)
+        self.origin = lo.min(axis=0)
+        i0 = np.floor((lo - self.origin) / self.cell).astype(np.int64)
+        i1 = np.floor((hi - self.origin) / self.cell).astype(np.int64)
+        self.shape = i1.max(axis=0) + 1
+        span = i1 - i0 + 1
+        count = span[:, 0] * span[:, 1]
+        item = np.repeat(np.arange(len(lo)), count)
+        local = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+        cx = i0[item, 0] + local // span[item, 1]
+        cy = i0[item, 1] + local % span[item, 1]
+        key = cx * self.shape[1] + cy
+        self.items = item[np.argsort(key, kind="stable")]
+        self.start = np.concatenate([[0], np.cumsum(np.bincount(key, minlength=int(np.prod(self.shape))))])
+
+    def cells(self, P):
+        """Integer (ix, iy) cell coordinates of points (not clipped)."""
+        return np.floor((P - self.origin) / self.cell).astype(np.int64)
+
+    def candidates(self, ij):
+        """(query index, item) pairs for cell coordinates ij (k, 2); off-grid cells give none."""
+        ok = np.all((ij >= 0) & (ij < self.shape), axis=1)
+        q = np.flatnonzero(ok)
+        key = ij[ok, 0] * self.shape[1] + ij[ok, 1]
+        s, cnt = self.start[key], self.start[key + 1] - self.start[key]
+        return np.repeat(q, cnt), self.items[_expand(s, cnt)]
+
+
+def _dot(u, v):
+    """Column-wise dot product of (d, m) arrays."""
+    out = u[0] * v[0]
+    for i in range(1, len(u)):
+        out += u[i] * v[i]
+    return out
+
+
+def _expand(start, count):
+    """Positions start[i] … start[i]+count[i]−1 for every i, concatenated."""
+    return np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count) + np.repeat(start, count)
+
+
+class _TriangleTree:
+    """
+    Balanced bounding-volume tree over triangles (n, 3, d). Node i of level k
+    holds the faces order[i·n//2ᵏ : (i+1)·n//2ᵏ]; its children are nodes 2i
+    and 2i+1 of level k+1, split at the median barycenter along the node's
+    widest axis. lo[k]/hi[k] are the node boxes of level k.
+
+    Faces reached at the leaves are first screened with a cheap lower bound on
+    their distance (the face's own oriented box); only survivors get the exact
+    point-triangle test.
+    """
+
+    def __init__(self, tri, leaf_size=LEAF_SIZE):
+        n = len(tri)
+        self.depth = int(np.ceil(np.log2(n / leaf_size))) if n > leaf_size else 0
+        center = tri.mean(axis=1)
+        order = np.arange(n)
+        pos = np.arange(n)
+        for k in range(self.depth):
+            starts = (np.arange(1 << k) * n) >> k
+            node = np.searchsorted(starts, pos, side="right") - 1
+            c = center[order]
+            extent = np.maximum.reduceat(c, starts) - np.minimum.reduceat(c, starts)
+            axis = np.argmax(extent, axis=1)
+            order = order[np.lexsort((c[pos, axis[node]], node))]
+        self.order = order
+        self.leaf_start = (np.arange((1 << self.depth) + 1) * n) >> self.depth
+
+        # Per-face data for the screen and the exact test, one row per
+        # quantity (column f is face f) so a gather of faces reads whole rows.
+        # The screen is the face's own oriented box: axes along its longest
+        # edge, across it in its plane and (3D) along its normal, with the
+        # triangle's extent on each. Long slivers keep a tight box.
+        d = tri.shape[2]
+        a, ab, ac = tri[:, 0], tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0]
+        edges = np.stack([ab, tri[:, 2] - tri[:, 1], -ac], axis=1)
+        u = edges[np.arange(n), np.argmax((edges * edges).sum(2), axis=1)]
+        if d == 3:
+            axes = [u, None, np.cross(ab, ac)]
+            axes[1] = np.cross(axes[2], u)
+        else:
+            axes = [u, np.stack([-u[:, 1], u[:, 0]], axis=1)]
+        rows, lo_ext, hi_ext = [], [], []
+        for ax in axes:
+            length = np.linalg.norm(ax, axis=1, keepdims=True)
+            ax = np.divide(ax, length, out=np.zeros_like(ax), where=length > 0)
+            t = np.einsum("fkd,fd->fk", tri, ax)
+            rows.append(ax)
+            lo_ext.append(t.min(1))
+            hi_ext.append(t.max(1))
+        self.screen_rows = np.ascontiguousarray(np.vstack([np.hstack(rows).T, lo_ext, hi_ext]))
+        gram = np.stack([(ab * ab).sum(1), (ab * ac).sum(1), (ac * ac).sum(1)], axis=1)
+        self.exact_rows = np.ascontiguousarray(np.hstack([a, ab, ac, gram]).T)
+
+        starts = self.leaf_start[:-1]
+        lo = [np.minimum.reduceat(tri.min(axis=1)[order], starts)]
+        hi = [np.maximum.reduceat(tri.max(axis=1)[order], starts)]
+        mid = [np.add.reduceat(center[order], starts)]
+        for _ in range(self.depth):
+            lo.append(np.minimum(lo[-1][0::2], lo[-1][1::2]))
+            hi.append(np.maximum(hi[-1][0::2], hi[-1][1::2]))
+            mid.append(mid[-1][0::2] + mid[-1][1::2])
+        self.lo = [np.ascontiguousarray(b.T) for b in lo[::-1]]
+        self.hi = [np.ascontiguousarray(b.T) for b in hi[::-1]]
+        # Mean barycenter of each node, to steer the greedy descent when a
+        # point lies inside both child boxes.
+        self.mid = [np.ascontiguousarray((m / np.diff((np.arange(len(m) + 1) * n) // len(m))[:, None]).T)
+                    for m in mid[::-1]]
+
+    # ------- per-pair distances (point column p[:, i] against face f[i]) -------
+    def _screen(self, p, f):
+        """Lower bound on the squared distance: distance to the face's oriented box."""
+        d = len(p)
+        s = self.screen_rows[:, f]
+        lb = np.zeros(len(f))
+        for i in range(d):
+            t = _dot(s[i * d:(i + 1) * d], p)
+            gap = np.maximum(s[d * d + i] - t, 0.0) + np.maximum(t - s[d * d + d + i], 0.0)
+            lb += gap * gap
+        return lb
+
+    def _exact(self, p, f):
+        """
+        Squared distance to the triangle and the smallest barycentric
+        coordinate of p's projection onto its plane (negative outside).
+        Closest-point regions as in Ericson, Real-Time Collision Detection
+        §5.1.5, with the dot products taken from the face's Gram matrix.
+        """
+        d = len(p)
+        e = self.exact_rows[:, f]
+        ap, ab, ac = p - e[:d], e[d:2 * d], e[2 * d:3 * d]
+        aa, bc, cc = e[3 * d], e[3 * d + 1], e[3 * d + 2]
+        d1, d2 = _dot(ab, ap), _dot(ac, ap)
+        d3, d4, d5, d6 = d1 - aa, d2 - bc, d1 - bc, d2 - cc
+        va, vb, vc = d3 * d6 - d5 * d4, d5 * d2 - d1 * d6, d1 * d4 - d3 * d2
+        with np.errstate(invalid="ignore", divide="ignore"):
+            det = aa * cc - bc * bc
+            v_in, w_in = (cc * d1 - bc * d2) / det, (aa * d2 - bc * d1) / det
+            w_bc = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+            conds = [
+                (d1 <= 0) & (d2 <= 0),                          # vertex a
+                (d3 >= 0) & (d4 <= d3),                         # vertex b
+                (d6 >= 0) & (d5 <= d6),                         # vertex c
+                (vc <= 0) & (d1 >= 0) & (d3 <= 0),              # edge ab
+                (vb <= 0) & (d2 >= 0) & (d6 <= 0),              # edge ac
+                (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0),    # edge bc
+            ]
+            v = np.select(conds, [0.0, 1.0, 0.0, d1 / (d1 - d3), 0.0, 1.0 - w_bc], v_in)
+            w = np.select(conds, [0.0, 0.0, 1.0, 0.0, d2 / (d2 - d6), w_bc], w_in)
+        r = ap - v * ab - w * ac
+        dist2 = _dot(r, r)
+        lam = np.minimum(np.minimum(v_in, w_in), 1.0 - v_in - w_in)
+        return np.where(np.isnan(dist2), np.inf, dist2), np.nan_to_num(lam, nan=-np.inf)
+
+    def _box_dist2(self, p, k, node):
+        gap = np.maximum(self.lo[k][:, node] - p, 0.0) + np.maximum(p - self.hi[k][:, node], 0.0)
+        return _dot(gap, gap)
+
+    def _leaf_faces(self, q, leaf):
+        s = self.leaf_start[leaf]
+        cnt = self.leaf_start[leaf + 1] - s
+        return np.repeat(q, cnt), self.order[_expand(s, cnt)]
+
+    # ------- queries (PT: points as columns, (d, n)) -------
+    def _leaf_min(self, PT, q, leaf, best_d2, best_f):
+        """
+        Fold the faces of the given leaves into the running nearest (best_*,
+        in place). Each point first tests the face with its smallest lower
+        bound, which usually tightens the bound to near the answer; only
+        faces still under it then get the exact test.
+        """
+        q, f = self._leaf_faces(q, leaf)
+        lb = self._screen(PT[:, q], f)
+        keep = lb <= best_d2[q]
+        q, f, lb = q[keep], f[keep], lb[keep]
+        low = np.full(len(best_d2), np.inf)
+        np.minimum.at(low, q, lb)
+        first = lb == low[q]
+        d2, _ = self._exact(PT[:, q[first]], f[first])
+        self._fold(q[first], f[first], d2, best_d2, best_f)
+        rest = ~first & (lb <= best_d2[q])
+        d2, _ = self._exact(PT[:, q[rest]], f[rest])
+        self._fold(q[rest], f[rest], d2, best_d2, best_f)
+
+    @staticmethod
+    def _fold(q, f, d2, best_d2, best_f):
+        """best_* ← the smaller (distance, face id) per query."""
+        old = best_d2.copy()
+        np.minimum.at(best_d2, q, d2)
+        best_f[best_d2 < old] = np.iinfo(best_f.dtype).max
+        tie = d2 == best_d2[q]
+        np.minimum.at(best_f, q[tie], f[tie])
+
+    def _descend(self, PT, q, node, bound, tighten=False):
+        """
+        (query, leaf) pairs under node whose boxes lie within bound[q]
+        (squared). With tighten, bound is lowered in place on the way down to
+        the farthest point of any box reached: every face of a node lies in
+        its box, so one of them is at least that close.
+        """
+        for k in range(self.depth + 1):
+            p, lo, hi = PT[:, q], self.lo[k][:, node], self.hi[k][:, node]
+            gap = np.maximum(lo - p, 0.0) + np.maximum(p - hi, 0.0)
+            d2 = _dot(gap, gap)
+            if tighten:
+                far = np.maximum(np.abs(p - lo), np.abs(p - hi))
+                np.minimum.at(bound, q, _dot(far, far))
+            keep = d2 <= bound[q]
+            q, node = q[keep], node[keep]
+            if k < self.depth:
+                q = np.repeat(q, 2)
+                node = (2 * node[:, None] + np.array([0, 1])).ravel()
+        return q, node
+
+    def nearest(self, P):
+        """(face, squared distance) of the nearest triangle for each point."""
+        n = len(P)
+        PT = np.ascontiguousarray(P.T)
+        best_d2 = np.full(n, np.inf)
+        best_f = np.full(n, np.iinfo(np.int64).max)
+
+        # Greedy descent to one leaf per point gives a finite initial bound.
+        node = np.zeros(n, dtype=np.int64)
+        for k in range(1, self.depth + 1):
+            left = 2 * node
+            dl, dr = self._box_dist2(PT, k, left), self._box_dist2(PT, k, left + 1)
+            ml, mr = PT - self.mid[k][:, left], PT - self.mid[k][:, left + 1]
+            node = left + ((dr < dl) | ((dr == dl) & (_dot(mr, mr) < _dot(ml, ml))))
+        self._leaf_min(PT, np.arange(n), node, best_d2, best_f)
+
+        # Branch and bound over the remaining leaves.
+        first = node
+        bound = best_d2.copy()
+        q, leaf = self._descend(PT, np.arange(n), np.zeros(n, dtype=np.int64), bound, tighten=True)
+        keep = leaf != first[q]
+        if keep.any():
+            self._leaf_min(PT, q[keep], leaf[keep], best_d2, best_f)
+        return best_f, best_d2
+
+    def within(self, P, r2):
+        """(query, face, squared distance, min barycentric) for every face within √r2 of P."""
+        n = len(P)
+        PT = np.ascontiguousarray(P.T)
+        q, leaf = self._descend(PT, np.arange(n), np.zeros(n, dtype=np.int64), np.full(n, r2))
+        q, f = self._leaf_faces(q, leaf)
+        lb = self._screen(PT[:, q], f)
+        q, f = q[lb <= r2], f[lb <= r2]
+        d2, lam = self._exact(PT[:, q], f)
+        hit = d2 <= r2
+        return q[hit], f[hit], d2[hit], lam[hit]
+
+
+class FaceGrid:
+    """
+    Index over the triangles of (V, F). With strict (the default) a planar
+    mesh whose triangles fold over or overlap is rejected, since locate and
+    the open-edge shortcut of nearest need a one-sheeted mesh; strict=False
+    accepts it and nearest then searches every face.
+    """
+
+    def __init__(self, V, F, cell=None, leaf_size=LEAF_SIZE, strict=True):
+        self.F = np.asarray(F)
+        if len(self.F) == 0:
+            raise ValueError("FaceGrid needs at least one face")
+        V = np.asarray(V, dtype=np.float64)
+        extent = np.ptp(V, axis=0)
+        self.planar = bool(V.shape[1] == 2 or extent[2] <= PLANAR_TOL * extent[:2].max())
+        self.dim = 2 if self.planar else 3
+        self.P = V[:, :self.dim]
+        self.scale = float(np.linalg.norm(extent)) or 1.0
+        tri = self.P[self.F]                                   # (nf, 3, dim)
+        self.bary = tri.mean(axis=1)
+        self.tree = _TriangleTree(tri, leaf_size)
+        self.rim = self.rim_tree = None
+        if not self.planar:
+            return
+
+        lo, hi = tri.min(axis=1), tri.max(axis=1)
+        if cell is None:
+            # About one triangle per cell on average.
+            cell = float(np.mean((hi - lo).max(axis=1))) or 1.0
+        self.tris = _Grid(lo, hi, cell)
+
+        # Affine map to barycentric (λ1, λ2); degenerate triangles never match.
+        self.a = tri[:, 0]
+        M = np.stack([tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0]], axis=2)  # columns e1, e2
+        det = M[:, 0, 0] * M[:, 1, 1] - M[:, 0, 1] * M[:, 1, 0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inv = np.stack([np.stack([M[:, 1, 1], -M[:, 0, 1]], axis=1),
+                            np.stack([-M[:, 1, 0], M[:, 0, 0]], axis=1)], axis=1) / det[:, None, None]
+        inv[det == 0] = np.nan
+        self.inv = inv
+        if not strict:
+            return
+        self._check_embedded(det)
+
+        # A point outside an embedded planar mesh is nearest to an open edge
+        # (used by one face), so nearest() only needs the faces touching an
+        # open edge's vertices; the tree holds just those.
+        nv = len(self.P)
+        e = np.sort(self.F[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1).astype(np.int64)
+        key, count = np.unique(e[:, 0] * nv + e[:, 1], return_counts=True)
+        open_v = np.zeros(nv, dtype=bool)
+        open_v[key[count != 2] // nv] = open_v[key[count != 2] % nv] = True
+        self.rim = np.flatnonzero(open_v[self.F].any(axis=1))
+        if len(self.rim) == 0:
+            self.rim = np.arange(len(self.F))
+        self.rim_tree = _TriangleTree(tri[self.rim], leaf_size)
+
+    def _check_embedded(self, det):
+        """Reject planar meshes whose triangles flip orientation or overlap."""
+        tiny = 1e-12 * np.abs(det).max()
+        if (det > tiny).any() and (det < -tiny).any():
+            raise ValueError("mesh projection folds over itself (triangles of both orientations)")
+        q, _ = self._containing(self.bary, eps=-1e-9)        # strict interiors only
+        covered = np.bincount(q, minlength=len(self.F))
+        if (covered > 1).any():
+            raise ValueError(f"mesh projection overlaps itself ({int((covered > 1).sum())} "
+                             "face barycenters lie inside several triangles)")
+
+    def _points(self, P):
+        P = np.asarray(P, dtype=np.float64)
+        if P.ndim != 2 or P.shape[1] < self.dim:
+            raise ValueError(f"points need {self.dim} columns for this mesh, got shape {P.shape}")
+        return P[:, :self.dim]
+
+    def _containing(self, P, eps):
+        """(query, face) pairs with P inside a planar face, barycentric tolerance eps."""
+        q, f = self.tris.candidates(self.tris.cells(P))
+        d = P[q] - self.a[f]
+        l1 = self.inv[f, 0, 0] * d[:, 0] + self.inv[f, 0, 1] * d[:, 1]
+        l2 = self.inv[f, 1, 0] * d[:, 0] + self.inv[f, 1, 1] * d[:, 1]
+        inside = (l1 >= -eps) & (l2 >= -eps) & (l1 + l2 <= 1.0 + eps)
+        return q[inside], f[inside]
+
+    def locate(self, P, eps=1e-9):
+        """
+        Face containing each point, −1 if none. Planar meshes use a
+        barycentric test with tolerance eps (lowest id on shared edges). On 3D
+        meshes every face within eps × the bounding-box diagonal qualifies,
+        and where faces overlap the one with P deepest inside it (largest
+        smallest barycentric coordinate) wins.
+        """
+        P = self._points(P)
+        if not self.planar:
+            out = np.full(len(P), -1, dtype=np.int64)
+            r2 = (eps * self.scale) ** 2
+            for b in range(0, len(P), BLOCK):
+                q, f, _, lam = self.tree.within(P[b:b + BLOCK], r2)
+                order = np.lexsort((f, -lam, q))
+                q, f = q[order], f[order]
+                head = np.concatenate([[True], q[1:] != q[:-1]]) if len(q) else np.zeros(0, bool)
+                out[b + q[head]] = f[head]
+            return out
+        out = np.full(len(P), len(self.F), dtype=np.int64)
+        for b in range(0, len(P), BLOCK):
+            q, f = self._containing(P[b:b + BLOCK], eps)
+            np.minimum.at(out[b:b + BLOCK], q, f)
+        out[out == len(self.F)] = -1
+        return out
+
+    def nearest(self, P):
+        """
+        Nearest triangle per point (lowest id on ties); returns (face,
+        distance). On planar meshes a point inside a face (as located) is at
+        distance 0.
+        """
+        P = self._points(P)
+        face = np.empty(len(P), dtype=np.int64)
+        dist = np.zeros(len(P))
+        todo, tree = np.arange(len(P)), self.tree
+        if self.rim_tree is not None:
+            face[:] = self.locate(P)
+            todo, tree = np.flatnonzero(face < 0), self.rim_tree
+        for b in range(0, len(todo), BLOCK):
+            idx = todo[b:b + BLOCK]
+            f, d2 = tree.nearest(P[idx])
+            face[idx] = f if tree is self.tree else self.rim[f]
+            dist[idx] = np.sqrt(d2)
+        return face, dist
+
+    def within(self, P, radius):
+        """(point index, face) pairs for every face within radius of each point."""
+        P = self._points(P)
+        qs, fs = [], []
+        for b in range(0, len(P), BLOCK):
+            q, f, _, _ = self.tree.within(P[b:b + BLOCK], float(radius) ** 2)
+            qs.append(q + b)
+            fs.append(f)
+        if not qs:
+            return np.zeros(0, np.int64), np.zeros(0, np.int64)
+        return np.concatenate(qs), np.concatenate(fs)
+
+    def probe(self, P, values, outside="nearest"):
+        """values[face containing P]; points off the mesh use the nearest face (or NaN)."""
+        face = self.locate(P)
+        miss = face < 0
+        out = np.full(len(face), np.nan)
+        out[~miss] = np.asarray(values)[face[~miss]]
+        if outside == "nearest" and miss.any():
+            out[miss] = np.asarray(values)[self.nearest(self._points(P)[miss])[0]]
+        return out
+
+
+def subtriangle_weights(m: int) -> np.ndarray:
+    """Barycentric (λ0, λ1, λ2) centroids of the m² equal sub-triangles of a triangle."""
+    i, j = np.meshgrid(np.arange(m), np.arange(m), indexing="ij")
+    up = i + j <= m - 1
+    down = i + j <= m - 2
+    l1 = np.concatenate([(3 * i[up] + 1), (3 * i[down] + 2)]) / (3.0 * m)
+    l2 = np.concatenate([(3 * j[up] + 1), (3 * j[down] + 2)]) / (3.0 * m)
+    return np.column_stack([1.0 - l1 - l2, l1, l2])
+
+
+def transfer_field(src_V, src_F, src_A, values, dst_V, dst_F, dst_A, samples=3,
+                   conserve=True, grid=None):
+    """
+    Per-face field from the source mesh onto the destination mesh.
+    samples=m gives m² equal-area sub-triangle samples per destination face,
+    taken in the index's dimension (3D unless the source is planar), so each
+    carries A/m² of the area used in the Σ values·A sums. A sample takes the
+    value of the source face it lies on, or of the nearest one.
+
+    info reports the sampling (outside_fraction, max_sample_distance) and the
+    Σ values·A mismatch of the plain average (dst_sum_A, rel_mismatch) before
+    any rescale. With conserve the result is then scaled to the source sum
+    (scale, conserved_sum_A). Returns (dst_values, info).
+    """
+    grid = grid or FaceGrid(src_V, src_F)
+    values = np.asarray(values, dtype=np.float64)
+    W = subtriangle_weights(samples)                                # (s, 3)
+    tri = grid._points(np.asarray(dst_V, dtype=np.float64))[dst_F]  # (nf, 3, dim)
+    P = np.einsum("sk,fkd->fsd", W, tri).reshape(-1, grid.dim)
+    owner = np.repeat(np.arange(len(dst_F)), len(W))
+
+    src_face = grid.locate(P)
+    miss = src_face < 0
+    dist = np.zeros(len(P))
+    if miss.any():
+        src_face[miss], dist[miss] = grid.nearest(P[miss])
+    out = np.bincount(owner, weights=values[src_face], minlength=len(dst_F)) / len(W)
+
+    src_total, dst_total = gb_sum(values, src_A), gb_sum(out, dst_A)
+    info = {
+        "samples_per_face": len(W),
+        "outside_fraction": float(miss.mean()),
+        "max_sample_distance": float(dist.max()) if len(dist) else 0.0,
+        "src_sum_A": src_total,
+        "dst_sum_A": dst_total,
+        "rel_mismatch": (dst_total - src_total) / abs(src_total) if src_total else float("nan"),
+        "scale": 1.0,
+    }
+    if conserve and dst_total != 0.0:
+        info["scale"] = src_total / dst_total
+        out *= info["scale"]
+        info["conserved_sum_A"] = gb_sum(out, dst_A)
+    return out, info
+
+
+def _read_field(spec, root):
+    """'file.csv:column' (column defaults to the last one) → 1-D array."""
+    path, _, col = spec.partition(":")
+    path = Path(path) if Path(path).is_file() else Path(root) / path
+    df = pd.read_csv(path)
+    return df[col].to_numpy(float) if col else df.iloc[:, -1].to_numpy(float)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Point probes and per-face field transfer between meshes")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    tr = sub.add_parser("transfer", help="carry a per-face field onto another mesh (Σ K·A preserved)")
+    tr.add_argument("src", help="source mesh CSV prefix")
+    tr.add_argument("field", help="per-face field CSV[:column] on the source mesh")
+    tr.add_argument("dst", help="destination mesh CSV prefix")
+    tr.add_argument("--samples", type=int, default=3, help="m: m² samples per destination face")
+    tr.add_argument("--no-conserve", action="store_true",
+                    help="skip the Σ K·A rescale (e.g. for ρ); the mismatch is reported either way")
+    tr.add_argument("--out", default=None, help="output CSV (default outputs/<dst>_<column>.csv)")
+    pr = sub.add_parser("probe", help="sample a per-face field at points")
+    pr.add_argument("mesh", help="mesh CSV prefix")
+    pr.add_argument("field", help="per-face field CSV[:column]")
+    pr.add_argument("points", help="CSV with x,y (and z for 3D meshes) columns")
+    pr.add_argument("--out", default="outputs/probe.csv")
+    ap.add_argument("--root", default=str(REPO_ROOT), help="directory holding the mesh CSVs")
+    args = ap.parse_args()
+
+    if args.cmd == "transfer":
+        sV, sF, sA = load_mesh_csv(args.src, args.root)
+        dV, dF, dA = load_mesh_csv(args.dst, args.root)
+        values = _read_field(args.field, args.root)
+        out, info = transfer_field(sV, sF, sA, values, dV, dF, dA, args.samples,
+                                   conserve=not args.no_conserve)
+        col = args.field.partition(":")[2] or "value"
+        path = Path(args.out or f"outputs/{Path(args.dst).name}_{col}.csv")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame({col: out}).to_csv(path, index=False)
+        print(info)
+        print("Wrote:", path)
+    else:
+        V, F, _ = load_mesh_csv(args.mesh, args.root)
+        grid = FaceGrid(V, F)
+        cols = ["x", "y", "z"][:grid.dim]
+        df = pd.read_csv(args.points)[cols]
+        pts = df.to_numpy(float)
+        face = grid.locate(pts)
+        vals = grid.probe(pts, _read_field(args.field, args.root))
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        df.assign(face=face, value=vals).to_csv(args.out, index=False)
+        print(f"{int((face >= 0).sum())}/{len(pts)} points inside the mesh; wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
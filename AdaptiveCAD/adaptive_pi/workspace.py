@@ -0,0 +1,183 @@
+"""
+Preallocated workspace for repeated adaptivecad_render pipeline runs on one mesh.
+
+compute_rho_field recomputes barycenters and radii and allocates about ten
+face-sized temporaries per call. PipelineWorkspace computes the barycenter
+radii once per mesh and owns every per-face buffer. Each run evaluates two
+fused passes in cache-sized blocks with out= ufuncs:
+
+    pass 1   r_model → K_raw, plus the partial Σ K_raw·A (float64)
+    pass 2   K = s·K_raw → ρ
+
+The returned K_face/ρ arrays are views of the workspace buffers and are
+overwritten by the next run(); pass copy=True to keep them.
+
+Usage:
+    python -m adaptive_pi.workspace --runs 2000 --mode exact
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from . import adaptivecad_render as acr
+from .rho_series import rho_adaptive
+
+BLOCK = 4096  # faces per block: a handful of float64 scratch rows stay in L1/L2
+
+
+class PipelineWorkspace:
+    def __init__(self, V, F, A, block=BLOCK):
+        self.A = np.ascontiguousarray(A)
+        self.dtype = self.A.dtype
+        self.n = len(F)
+        self.block = int(block)
+        self.counters = {"runs": 0, "blocks": 0, "buffers_allocated": 0, "bytes_allocated": 0}
+        self._bufs = {}
+
+        # Mesh-static stage, done once: |barycenter| per face.
+        r = self._buffer("r_mesh", self.n)
+        r[:] = np.linalg.norm(V[F].mean(axis=1), axis=1)
+        self.r_max = float(r.max())
+
+    def _buffer(self, name, n, dtype=None):
+        """Named buffer, allocated once (and counted)."""
+        dtype = np.dtype(dtype or self.dtype)
+        buf = self._bufs.get(name)
+        if buf is None or len(buf) != n or buf.dtype != dtype:
+            buf = np.empty(n, dtype=dtype)
+            self._bufs[name] = buf
+            self.counters["buffers_allocated"] += 1
+            self.counters["bytes_allocated"] += buf.nbytes
+        return buf
+
+    def run(self, mode=acr.MODE, rv=acr.R_V, rf=acr.R_F, c=acr.C_CONST,
+            r_model_max=acr.R_MODEL, k0=acr.K0, beta=acr.BETA, target_chi=-4,
+            rho_tol=acr.RHO_TOL, copy=False):
+        """Same inputs and outputs as adaptivecad_render.compute_rho_field."""
+        n, B = self.n, self.block
+        r_mesh = self._bufs["r_mesh"]
+        K = self._buffer("K_face", n)
+        rho = self._buffer("rho", n)
+        t1 = self._buffer("tmp1", min(B, n))
+        t2 = self._buffer("tmp2", min(B, n))
+        t64 = self._buffer("tmp64", min(B, n), np.float64)
+        neg = self._buffer("neg", min(B, n), bool)
+        pos = self._buffer("pos", min(B, n), bool)
+        r_scale = float(r_model_max / self.r_max)
+
+        # === pass 1: K_raw (kept in K) and Σ K_raw·A ===
+        S = 0.0
+        for a in range(0, n, B):
+            b = min(a + B, n)
+            k, w = K[a:b], t1[:b - a]
+            np.multiply(r_mesh[a:b], r_scale, out=w)
+            np.multiply(w, w, out=w)
+            np.multiply(w, beta, out=k)
+            np.add(k, k0, out=k)
+            S += self._dot(k, self.A[a:b], t64[:b - a])
+            self.counters["blocks"] += 1
+
+        target = 2.0 * math.pi * float(target_chi)
+        s = target / S
+
+        # === pass 2: K = s·K_raw, ρ(K) ===
+        rho_info = None
+        if mode == "adaptive":
+            np.multiply(K, s, out=K)
+            # The series/exact split needs masks and fancy indexing; kept whole-array.
+            rho[:], rho_info = rho_adaptive(K, rv, rf, rho_tol)
+        else:
+            c_eff = (rf * rf - rv * rv) / 6.0 if c is None else c
+            for a in range(0, n, B):
+                b = min(a + B, n)
+                k, out = K[a:b], rho[a:b]
+                np.multiply(k, s, out=k)
+                if mode == "tempered":
+                    np.multiply(k, c_eff, out=out)
+                    np.add(out, 1.0, out=out)
+                else:
+                    self._exact_block(k, rv, rf, out, t1[:b - a], t2[:b - a],
+                                      neg[:b - a], pos[:b - a])
+
+        SKA = sum(self._dot(K[a:a + B], self.A[a:a + B], t64[:min(B, n - a)]) for a in range(0, n, B))
+        self.counters["runs"] += 1
+        stats = {
+            "mode": mode, "r_v": rv, "r_f": rf, "c": c, "r_scale": r_scale,
+            "GB_scale": s, "GB_sum_KA": SKA, "GB_target": target,
+            "K_min": float(K.min()), "K_max": float(K.max()), "K_mean": float(K.mean()),
+            "rho_min": float(rho.min()), "rho_max": float(rho.max()), "rho_mean": float(rho.mean()),
+        }
+        if rho_info is not None:
+            stats["rho_adaptive"] = rho_info
+        if copy:
+            return K.copy(), rho.copy(), stats
+        return K, rho, stats
+
+    @staticmethod
+    def _dot(x, y, tmp64):
+        """Σ x·y in float64 without a face-sized temporary."""
+        if x.dtype == np.float64 and y.dtype == np.float64:
+            return float(np.dot(x, y))
+        np.multiply(x, y, out=tmp64)
+        return float(tmp64.sum())
+
+    @staticmethod
+    def _exact_block(k, rv, rf, out, t, u, neg, pos):
+        """ρ = h(K rv²)/h(K rf²) in place (sinh law for K < 0, sin law for K > 0)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            np.less(k, 0.0, out=neg)
+            np.logical_not(neg, out=pos)
+            np.abs(k, out=t)
+            np.sqrt(t, out=t)
+            for r, dst in ((rv, out), (rf, u)):
+                np.multiply(t, r, out=dst)
+                np.sinh(dst, out=dst, where=neg)
+                np.sin(dst, out=dst, where=pos)
+                np.divide(dst, t, out=dst)
+                np.divide(dst, r, out=dst)
+            np.divide(out, u, out=out)
+            np.equal(k, 0.0, out=neg)
+            np.copyto(out, 1.0, where=neg)
+
+    def instrumentation(self) -> dict:
+        """Runs, blocks and buffer allocations so far (allocations stop after the first run)."""
+        return dict(self.counters, buffers=len(self._bufs),
+                    resident_bytes=sum(b.nbytes for b in self._bufs.values()))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Time repeated ρ/K runs: workspace vs compute_rho_field")
+    ap.add_argument("--runs", type=int, default=1000)
+    ap.add_argument("--mode", choices=["tempered", "exact", "adaptive"], default="exact")
+    ap.add_argument("--tile", type=int, default=1, help="repeat the mesh faces this many times (bigger arrays)")
+    args = ap.parse_args()
+
+    V, F, A = acr.load_mesh_from_adaptivecad()
+    F, A = np.tile(F, (args.tile, 1)), np.tile(A, args.tile)
+    ks = np.linspace(acr.K0 - 1.0, acr.K0 + 1.0, args.runs)
+
+    t0 = time.perf_counter()
+    for k0 in ks:
+        K_ref, rho_ref, _ = acr.compute_rho_field(V, F, A, args.mode, k0=k0)
+    t_ref = time.perf_counter() - t0
+
+    ws = PipelineWorkspace(V, F, A)
+    t0 = time.perf_counter()
+    for k0 in ks:
+        K, rho, _ = ws.run(args.mode, k0=k0)
+    t_ws = time.perf_counter() - t0
+    print({
+        "faces": len(F), "runs": args.runs, "mode": args.mode,
+        "compute_rho_field_ms": round(1e3 * t_ref / args.runs, 4),
+        "workspace_ms": round(1e3 * t_ws / args.runs, 4),
+        "max_abs_diff_K": float(np.abs(K - K_ref).max()),
+        "max_abs_diff_rho": float(np.abs(rho - rho_ref).max()),
+        **ws.instrumentation(),
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests import the package as `adaptive_pi`, like the `python -m adaptive_pi.X` entry points.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
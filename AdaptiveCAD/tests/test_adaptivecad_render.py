@@ -0,0 +1,13 @@
+import subprocess
+import sys
+
+from adaptive_pi import adaptivecad_render as acr
+
+
+def test_imports_as_plain_script(tmp_path):
+    # A fresh interpreter outside the package: the relative imports must resolve.
+    code = (f"import runpy; g = runpy.run_path({str(acr.__file__)!r}, run_name='script'); "
+            "print(g['__package__'], callable(g['compute_rho_field']))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, capture_output=True, text=True)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.split() == ["adaptive_pi", "True"]
@@ -0,0 +1,50 @@
+import math
+
+import numpy as np
+import pytest
+
+from adaptive_pi.batch import JOB_DEFAULTS, run_batch
+from adaptive_pi.mesh_io import REPO_ROOT, load_mesh_csv
+
+MESHES = {"user_params": {"prefix": "user_params", "root": REPO_ROOT}}
+
+
+def job(**kw):
+    return dict(JOB_DEFAULTS, mesh="user_params", **kw)
+
+
+def test_empty_job_list():
+    table = run_batch(MESHES, [])
+    assert len(table) == 0 and "status" in table.columns
+
+
+@pytest.mark.parametrize("jobs", [[job(id="a"), job(id="a", rho=1.5)], [job(id="a"), job()]])
+def test_duplicate_or_missing_ids_rejected(jobs):
+    with pytest.raises(ValueError):
+        run_batch(MESHES, jobs)
+
+
+def test_rows_in_job_order_and_gauss_bonnet(tmp_path):
+    jobs = [job(id="b", mode="exact"), job(id="a", rho=1.5)]
+    table = run_batch(MESHES, jobs, workers=2, out_dir=tmp_path)
+    assert list(table["id"]) == ["b", "a"]
+    assert (table["status"] == "ok").all()
+    _, _, A = load_mesh_csv("user_params")
+    for name in ("a", "b"):
+        K = np.load(tmp_path / f"{name}.npz")["K_face"]
+        assert float(K @ A) == pytest.approx(2 * math.pi * -4, rel=1e-10)
+
+
+def test_compact_drift_is_measured_against_the_loaded_mesh(tmp_path):
+    # The reference is the double-precision run on the mesh as loaded, so the
+    # float32 input rounding shows up in the drift.
+    run_batch(MESHES, [job(id="ref", mode="exact")], workers=1, out_dir=tmp_path)
+    (tmp_path / "c").mkdir()
+    table = run_batch(MESHES, [job(id="c", mode="exact")], workers=1, out_dir=tmp_path / "c",
+                      precision="compact")
+    ref, got = np.load(tmp_path / "ref.npz"), np.load(tmp_path / "c" / "c.npz")
+    assert got["K_face"].dtype == np.float32
+    for name in ("K_face", "rho"):
+        expect = np.abs(got[name].astype(np.float64) - ref[name]).max()
+        assert table[f"drift_{name}_max_abs"].iloc[0] == pytest.approx(expect, rel=1e-12)
+        assert expect > 0
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from adaptive_pi.combinatorial_map import CombinatorialMap
+from adaptive_pi.mesh_io import REPO_ROOT
+
+
+def direct_chi(F):
+    """V − E + F counted straight from a triangle list."""
+    e = np.sort(np.concatenate([F[:, [0, 1]], F[:, [1, 2]], F[:, [2, 0]]]), axis=1)
+    return len(np.unique(F)) - len(np.unique(e, axis=0)) + len(F)
+
+
+def map_from_triangles(F):
+    """Darts are the directed triangle edges; edge pairs each with its reverse."""
+    tail, head = F.ravel(), np.roll(F, -1, axis=1).ravel()
+    d = np.arange(len(tail))
+    face = 3 * (d // 3) + (d + 1) % 3
+    key = {(a, b): i for i, (a, b) in enumerate(zip(tail, head))}
+    edge = np.array([key[b, a] for a, b in zip(tail, head)])
+    return CombinatorialMap.from_oriented(face, edge)
+
+
+def test_klein_quartic_mesh_chi():
+    F = np.loadtxt(REPO_ROOT / "klein_faces.csv", delimiter=",", skiprows=1, dtype=int)
+    cmap = map_from_triangles(F)
+    info = cmap.summary()
+    assert info["chi"] == direct_chi(F) == -4
+    assert info["orientable"] and cmap.genus() == 3
+    assert cmap.dual().summary()["chi"] == -4
+    tri, _ = cmap.to_mesh()
+    assert direct_chi(tri) == -4
+
+
+def test_klein_14gon_opposite_gluing():
+    d = np.arange(14)
+    cmap = CombinatorialMap.from_oriented((d + 1) % 14, (d + 7) % 14)
+    assert cmap.summary() == {"V": 2, "E": 7, "F": 1, "chi": -4, "orientable": True,
+                              "components": 1}
+
+
+def test_rejects_non_involution():
+    with pytest.raises(ValueError):
+        CombinatorialMap.from_oriented(np.array([1, 2, 0]), np.array([1, 2, 0]))
@@ -0,0 +1,43 @@
+import math
+
+import numpy as np
+import pytest
+
+from adaptive_pi.editing import EditSession
+from adaptive_pi.mesh_io import load_mesh_csv
+
+
+@pytest.fixture(scope="module")
+def mesh():
+    return load_mesh_csv("user_params")
+
+
+@pytest.mark.parametrize("compensation", ["global", "local"])
+def test_brush_matches_scan_and_keeps_gauss_bonnet(mesh, compensation):
+    V, F, A = mesh
+    session = EditSession(V, F, A, 1.7, compensation=compensation)
+    rng = np.random.default_rng(0)
+    for _ in range(30):
+        center = session.bary[rng.integers(len(F))] + rng.normal(0, 0.05, 3)
+        radius = rng.uniform(0.02, 0.3)
+        before = session.rho.copy()
+        new_rho = round(rng.uniform(1.4, 2.0), 3)
+        session.brush(center, radius, new_rho)
+        scan = np.flatnonzero(((session.bary - center) ** 2).sum(1) <= radius * radius)
+        expect = before.copy()
+        expect[scan] = new_rho
+        np.testing.assert_array_equal(session.rho, expect)
+    K = session.K_face()
+    assert float(K @ A) == pytest.approx(2 * math.pi * -4, abs=1e-9)
+
+
+def test_global_rescale_only_when_the_scale_moves():
+    # Two congruent triangles: swapping their ρ leaves Σ K_raw·A unchanged.
+    V = np.array([[0.0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]])
+    F = np.array([[0, 1, 2], [0, 2, 3]])
+    session = EditSession(V, F, [0.5, 0.5], 1.7, target_chi=1)
+    assert session.set_rho([0, 1], [1.5, 1.9])["global_rescale"]
+    scale = session.scale
+    out = session.set_rho([0, 1], [1.9, 1.5])
+    assert not out["global_rescale"] and session.scale == scale
+    assert abs(session.gb_error()) <= 1e-12 * 2 * math.pi
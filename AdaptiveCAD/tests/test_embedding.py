@@ -0,0 +1,38 @@
+import math
+
+import numpy as np
+
+from adaptive_pi.embedding import boundary_loop, circle_packing, mesh_edges, packing_face_areas, tutte_layout
+from adaptive_pi.hyperbolic_tiling import tiling_mesh
+from adaptive_pi.mesh_io import REPO_ROOT
+
+
+def test_tutte_interior_vertices_sit_at_the_neighbour_mean():
+    _, F, _ = tiling_mesh(7, 3, 3)
+    xy, _ = tutte_layout(F)
+    E = mesh_edges(F)[0]
+    bnd = boundary_loop(F)
+    np.testing.assert_allclose(np.linalg.norm(xy[bnd], axis=1), 1.0)
+    for v in np.setdiff1d(np.unique(F), bnd):
+        nbr = np.concatenate([E[E[:, 0] == v, 1], E[E[:, 1] == v, 0]])
+        np.testing.assert_allclose(xy[v], xy[nbr].mean(axis=0), atol=1e-8)
+
+
+def _angle_sums(F, r):
+    """Per-vertex corner angles from the hyperbolic law of cosines."""
+    out = np.zeros(len(r))
+    for tri in F:
+        for k in range(3):
+            a, b, c = tri[k], tri[(k + 1) % 3], tri[(k + 2) % 3]
+            x, y, z = r[a] + r[b], r[a] + r[c], r[b] + r[c]
+            cos_t = (math.cosh(x) * math.cosh(y) - math.cosh(z)) / (math.sinh(x) * math.sinh(y))
+            out[a] += math.acos(cos_t)
+    return out
+
+
+def test_klein_packing_closes_and_has_area_minus_two_pi_chi():
+    F = np.loadtxt(REPO_ROOT / "klein_faces.csv", delimiter=",", skiprows=1, dtype=int)
+    r, history = circle_packing(F, tol=1e-10)
+    assert history[-1] <= 1e-10
+    np.testing.assert_allclose(_angle_sums(F, r), 2 * math.pi, atol=1e-9)
+    assert abs(packing_face_areas(F, r).sum() - 8 * math.pi) < 1e-7
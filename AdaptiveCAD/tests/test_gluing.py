@@ -0,0 +1,33 @@
+import sys
+
+import pytest
+
+from adaptive_pi.gluing import glue_polygon, main, opposite_pairing, standard_word, word_pairing
+
+
+def test_klein_14gon_chi():
+    out = glue_polygon(14, *opposite_pairing(14))
+    assert (out["V"], out["E"], out["F"], out["chi"]) == (2, 7, 1, -4)
+    assert out["orientable"] and out["genus"] == 3
+
+
+@pytest.mark.parametrize("g", [1, 3, 50])
+def test_standard_word_genus(g):
+    word = standard_word(g)
+    out = glue_polygon(len(word), *word_pairing(word))
+    assert out["chi"] == 2 - 2 * g and out["genus"] == g
+
+
+def test_projective_plane():
+    out = glue_polygon(2, *word_pairing([1, 1]))
+    assert out["chi"] == 1 and not out["orientable"]
+
+
+@pytest.mark.parametrize("argv", [["--genus", "0"], ["--genus", "-2"], ["--word", ""],
+                                  ["--word", "1 x"], ["--opposite", "0"], ["--opposite", "7"]])
+def test_cli_rejects_empty_or_bad_polygons(argv, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["gluing", *argv])
+    with pytest.raises(SystemExit) as exc:
+        main()
+    assert exc.value.code == 2
+    assert "error:" in capsys.readouterr().err
@@ -0,0 +1,24 @@
+import math
+
+import numpy as np
+import pytest
+
+from adaptive_pi.hyperbolic_tiling import euler_counts_mesh, hyperbolic_triangle_areas, tiling_mesh
+
+
+@pytest.mark.parametrize("p, q", [(7, 3), (3, 7), (5, 4)])
+def test_tiles_have_the_gauss_bonnet_area(p, q):
+    # A regular p-gon with interior angles 2π/q has area (p − 2)π − 2πp/q.
+    V, F, tile = tiling_mesh(p, q, 3)
+    area = np.bincount(tile, weights=hyperbolic_triangle_areas(V, F))
+    np.testing.assert_allclose(area, (p - 2) * math.pi - 2 * math.pi * p / q, rtol=1e-9)
+
+
+def test_vertices_are_merged():
+    V, F, _ = tiling_mesh(7, 3, 3)
+    d = np.linalg.norm(V[:, None] - V[None], axis=2)
+    np.fill_diagonal(d, np.inf)
+    shortest_edge = np.linalg.norm(V[F[:, 1]] - V[F[:, 2]], axis=1).min()
+    assert d.min() > 0.5 * shortest_edge
+    n_v, n_e, n_f = euler_counts_mesh(F)
+    assert n_v - n_e + n_f == 1  # a disk
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from adaptive_pi.render_pool import RenderPool, render_face_png
+
+V = np.array([[0.0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]])
+F = np.array([[0, 1, 2], [0, 2, 3]])
+
+
+def test_pool_writes_the_same_png_as_an_inline_render(tmp_path):
+    render_face_png(V, F, [1.0, 2.0], str(tmp_path / "inline.png"), title="t")
+    with RenderPool(workers=1, max_pending=1) as pool:
+        for i in range(3):
+            pool.submit(V, F, [1.0, 2.0], str(tmp_path / f"pool{i}.png"), title="t")
+        pool.wait()
+        assert pool.pending() == 0
+    ref = (tmp_path / "inline.png").read_bytes()
+    for i in range(3):
+        assert (tmp_path / f"pool{i}.png").read_bytes() == ref
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_render_errors_surface_in_wait(tmp_path, workers):
+    with RenderPool(workers=workers) as pool:
+        pool.submit(V, F, [1.0, 2.0, 3.0], str(tmp_path / "bad.png"))  # wrong value count
+        with pytest.raises(ValueError):
+            pool.wait()
+        pool.wait()  # reported once
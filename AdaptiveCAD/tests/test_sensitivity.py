@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from adaptive_pi import adaptivecad_render as acr
+from adaptive_pi.mesh_io import load_mesh_csv
+from adaptive_pi.sensitivity import PARAMS, sensitivity_maps
+
+# PARAMS name → compute_rho_field keyword
+KWARGS = {"R_V": "rv", "R_F": "rf", "C_CONST": "c", "R_MODEL": "r_model_max",
+          "K0": "k0", "BETA": "beta"}
+BASE = {"rv": 2.09, "rf": 0.8, "c": -0.623, "r_model_max": acr.R_MODEL, "k0": acr.K0,
+        "beta": acr.BETA}
+
+
+@pytest.mark.parametrize("mode", ["exact", "tempered"])
+def test_sensitivities_match_finite_differences(mode):
+    V, F, A = load_mesh_csv("user_params")
+    maps = sensitivity_maps(V, F, A, mode, **BASE)
+    for p in PARAMS:
+        key = KWARGS[p]
+        h = 1e-6 * max(abs(BASE[key]), 1.0)
+        K_up, rho_up, _ = acr.compute_rho_field(V, F, A, mode, **dict(BASE, **{key: BASE[key] + h}))
+        K_dn, rho_dn, _ = acr.compute_rho_field(V, F, A, mode, **dict(BASE, **{key: BASE[key] - h}))
+        for name, up, dn in (("dK", K_up, K_dn), ("drho", rho_up, rho_dn)):
+            fd = (up - dn) / (2 * h)
+            scale = max(np.abs(fd).max(), 1.0)
+            np.testing.assert_allclose(maps[name][p], fd, rtol=1e-5, atol=1e-6 * scale,
+                                       err_msg=f"{name}/{p}")
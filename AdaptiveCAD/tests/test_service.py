@@ -0,0 +1,53 @@
+import asyncio
+import math
+
+import pytest
+
+from adaptive_pi.service import (BadRequest, Batcher, MeshStore, NotFound, QueryService,
+                                 eval_rho_field)
+
+
+@pytest.fixture(scope="module")
+def store():
+    return MeshStore()
+
+
+@pytest.mark.parametrize("name", ["../user_params", "user_params/..", "/etc/passwd", "klein"])
+def test_mesh_names_outside_allow_list_rejected(store, name):
+    with pytest.raises(BadRequest):
+        store.get(name)
+
+
+def test_gauss_bonnet_target_and_zero_sum_guard(store):
+    ok, flat = eval_rho_field([{"mesh": "user_params"}, {"mesh": "user_params", "k0": 0, "beta": 0}],
+                              store)
+    assert ok["GB_sum_KA"] == pytest.approx(2 * math.pi * -4, rel=1e-12)
+    assert flat["GB_scale"] == 1.0
+    assert math.isfinite(flat["K_min"]) and math.isfinite(flat["rho_max"])
+
+
+def test_batch_isolates_a_failing_request(store):
+    async def run():
+        batcher = Batcher(lambda reqs: eval_rho_field(reqs, store), window=0.05)
+        good = {"mesh": "user_params", "r_v": "2.0"}
+        return await asyncio.gather(batcher(good), batcher({"mesh": "user_params", "r_v": "x"}),
+                                    batcher(good), return_exceptions=True)
+
+    a, bad, b = asyncio.run(run())
+    assert isinstance(bad, BadRequest)
+    assert a["r_v"] == b["r_v"] == 2.0
+
+
+def test_render_path_is_fixed_and_unknown_path_is_404(tmp_path, monkeypatch, store):
+    monkeypatch.chdir(tmp_path)
+    svc = QueryService(store=store, render_workers=0)
+    try:
+        res = asyncio.run(svc.handle("/rho_field", {"mesh": "user_params", "render": "../../x"}))
+        assert "png" not in res
+        res = asyncio.run(svc.handle("/rho_field", {"mesh": "user_params", "render": "1"}))
+        assert res["png"] == "outputs/service_user_params_rho.png"
+        assert sorted(p.name for p in tmp_path.rglob("*.png")) == ["service_user_params_rho.png"]
+        with pytest.raises(NotFound):
+            asyncio.run(svc.handle("/nope", {}))
+    finally:
+        svc.close()
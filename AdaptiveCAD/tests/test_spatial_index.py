@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from adaptive_pi.mesh_io import load_mesh_csv
+from adaptive_pi.spatial_index import FaceGrid, transfer_field
+
+
+def _segment_dist(p, a, b):
+    t = np.clip(np.dot(p - a, b - a) / np.dot(b - a, b - a), 0.0, 1.0)
+    return np.linalg.norm(p - (a + t * (b - a)))
+
+
+def _triangle_dist(p, a, b, c):
+    """Plane distance if p projects inside the triangle, else the nearest edge."""
+    n = np.cross(b - a, c - a)
+    n /= np.linalg.norm(n)
+    q = p - np.dot(p - a, n) * n
+    signs = [np.dot(np.cross(v - u, q - u), n) for u, v in ((a, b), (b, c), (c, a))]
+    if min(signs) >= 0 or max(signs) <= 0:
+        return abs(np.dot(p - a, n))
+    return min(_segment_dist(p, a, b), _segment_dist(p, b, c), _segment_dist(p, c, a))
+
+
+@pytest.fixture(scope="module")
+def mesh():
+    return load_mesh_csv("user_params")
+
+
+def test_nearest_3d_matches_brute_force(mesh):
+    V, F, _ = mesh
+    grid = FaceGrid(V, F)
+    rng = np.random.default_rng(1)
+    lo, hi = V.min(0), V.max(0)
+    P = rng.uniform(lo - 0.1 * (hi - lo), hi + 0.1 * (hi - lo), size=(20, 3))
+    face, dist = grid.nearest(P)
+    for p, f, d in zip(P, face, dist):
+        ref = np.array([_triangle_dist(p, *V[tri]) for tri in F])
+        assert d == pytest.approx(ref.min(), rel=1e-9, abs=1e-12)
+        assert ref[f] == pytest.approx(ref.min(), rel=1e-9, abs=1e-12)
+
+
+def test_locate_own_barycenters(mesh):
+    V, F, _ = mesh
+    grid = FaceGrid(V, F)
+    face = grid.locate(V[F].mean(axis=1))
+    assert (face >= 0).all()
+    _, dist = grid.nearest(V[F].mean(axis=1))
+    assert dist.max() < 1e-12
+
+
+def test_folded_planar_projection_is_rejected():
+    V, F, _ = load_mesh_csv("klein")
+    with pytest.raises(ValueError, match="folds over itself|overlaps itself"):
+        FaceGrid(V, F)
+
+
+def test_self_transfer_conserves_gauss_bonnet_sum(mesh):
+    V, F, A = mesh
+    K = np.random.default_rng(2).normal(-1.0, 0.3, len(F))
+    out, info = transfer_field(V, F, A, K, V, F, A, samples=2)
+    assert np.isfinite(info["rel_mismatch"])
+    assert info["conserved_sum_A"] == pytest.approx(float(K @ A), rel=1e-12)
+    assert float(out @ A) == pytest.approx(float(K @ A), rel=1e-12)
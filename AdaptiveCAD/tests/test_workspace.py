@@ -0,0 +1,21 @@
+import math
+
+import numpy as np
+import pytest
+
+from adaptive_pi import adaptivecad_render as acr
+from adaptive_pi.mesh_io import load_mesh_csv
+from adaptive_pi.workspace import PipelineWorkspace
+
+
+@pytest.mark.parametrize("mode", ["exact", "adaptive"])
+def test_workspace_matches_compute_rho_field(mode):
+    V, F, A = load_mesh_csv("user_params")
+    ws = PipelineWorkspace(V, F, A, block=128)
+    K_ref, rho_ref, _ = acr.compute_rho_field(V, F, A, mode)
+    for _ in range(2):  # second run reuses the buffers
+        K, rho, _ = ws.run(mode)
+        np.testing.assert_allclose(K, K_ref, rtol=1e-12, atol=0)
+        np.testing.assert_allclose(rho, rho_ref, rtol=1e-10, atol=0)
+    assert float(K @ A) == pytest.approx(2 * math.pi * -4, rel=1e-12)
+